@@ -0,0 +1,6 @@
+-- Migration script to record which commit code quality metrics were computed from
+
+-- Add snapshot columns used to skip re-analysis when HEAD is unchanged
+ALTER TABLE code_quality_metrics
+ADD COLUMN IF NOT EXISTS commit_sha VARCHAR(40),
+ADD COLUMN IF NOT EXISTS analyzer_version VARCHAR(20);
@@ -1,8 +1,27 @@
 """Analyzers package for calculating metrics."""
 
-from .commit_analyzer import CommitAnalyzer
-from .pr_analyzer import PRAnalyzer
-from .issue_analyzer import IssueAnalyzer
-from .repository_analyzer import RepositoryAnalyzer
+import importlib
 
 __all__ = ["CommitAnalyzer", "PRAnalyzer", "IssueAnalyzer", "RepositoryAnalyzer"]
+
+# Analyzer modules pull in radon, requests, sqlalchemy, etc., so they are only
+# imported the first time one of their classes is accessed (PEP 562)
+_MODULES = {
+    "CommitAnalyzer": ".commit_analyzer",
+    "PRAnalyzer": ".pr_analyzer",
+    "IssueAnalyzer": ".issue_analyzer",
+    "RepositoryAnalyzer": ".repository_analyzer",
+}
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        module = importlib.import_module(_MODULES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
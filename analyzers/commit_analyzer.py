@@ -1,9 +1,8 @@
 """Analyzer for commit metrics."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from database import DatabaseManager
 from llm import OpenAIClient
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 class CommitAnalyzer:
@@ -14,74 +13,49 @@ class CommitAnalyzer:
         self.db = db_manager
         self.llm = llm_client
 
-    def _analyze_single_commit(self, repo_id: int, commit_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze a single commit (used for parallel processing).
+    def analyze_commits(self, repo_id: int, commits: List[Dict[str, Any]], progress_callback=None,
+                        batch_size: int = 500, contributor_ids: Optional[Dict[str, int]] = None):
+        """Analyze commits and store them with batched database writes.
 
-        Args:
-            repo_id: Repository ID
-            commit_data: Commit data from GitHub API
-
-        Returns:
-            Dict with analysis results
-        """
-        try:
-            # Get or create contributor
-            contributor = self.db.get_or_create_contributor(
-                commit_data["contributor"])
-
-            # Save commit
-            commit_record = self.db.save_commit({
-                "repo_id": repo_id,
-                "contributor_id": contributor.id,
-                "sha": commit_data["sha"],
-                "message": commit_data["message"],
-                "additions": commit_data["additions"],
-                "deletions": commit_data["deletions"],
-                "files_changed": commit_data["files_changed"],
-                "committed_at": commit_data["committed_at"],
-            })
-
-            return {"success": True, "sha": commit_data["sha"][:7]}
-        except Exception as e:
-            return {"success": False, "sha": commit_data["sha"][:7], "error": str(e)}
-
-    def analyze_commits(self, repo_id: int, commits: List[Dict[str, Any]], progress_callback=None, max_workers: int = 30):
-        """Analyze commits and store metrics with parallel processing.
+        Contributors are upserted in one statement and commits are inserted in
+        batches on a single connection, instead of two round-trips per commit.
 
         Args:
             repo_id: Repository ID
             commits: List of commit data from GitHub API
             progress_callback: Optional callback for progress updates
-            max_workers: Number of parallel workers for LLM analysis (default: 5)
+            batch_size: Number of commits written per transaction (default: 500)
+            contributor_ids: Optional username -> contributor id map already
+                resolved for this run; built here if not provided
         """
         total = len(commits)
-        print(
-            f"[Commit Analyzer] Starting parallel analysis of {total} commits with {max_workers} workers...")
-
-        completed = 0
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all commit analysis tasks
-            future_to_commit = {
-                executor.submit(self._analyze_single_commit, repo_id, commit_data): commit_data
-                for commit_data in commits
-            }
-
-            # Process results as they complete
-            for future in as_completed(future_to_commit):
-                completed += 1
-                result = future.result()
-
-                if progress_callback:
-                    commit_data = future_to_commit[future]
-                    progress_callback(
-                        completed, total, f"Analyzing commit {commit_data['sha'][:7]}")
-
-                print(
-                    f"[Commit Analyzer] Analyzed {completed}/{total} commits...")
-
-                if not result["success"]:
-                    print(
-                        f"[Commit Analyzer] Warning: Failed to analyze commit {result['sha']}: {result.get('error', 'Unknown error')}")
+        print(f"[Commit Analyzer] Starting bulk analysis of {total} commits...")
+
+        # Resolve every author to a contributor id up front
+        if contributor_ids is None:
+            contributor_ids = self.db.get_or_create_contributors(
+                [commit_data["contributor"] for commit_data in commits])
+
+        commit_rows = [{
+            "repo_id": repo_id,
+            "contributor_id": contributor_ids.get(commit_data["contributor"]["username"]),
+            "sha": commit_data["sha"],
+            "message": commit_data["message"],
+            "additions": commit_data["additions"],
+            "deletions": commit_data["deletions"],
+            "files_changed": commit_data["files_changed"],
+            "committed_at": commit_data["committed_at"],
+        } for commit_data in commits]
+
+        for start in range(0, total, batch_size):
+            batch = commit_rows[start:start + batch_size]
+            self.db.save_commits_bulk(batch)
+
+            saved = start + len(batch)
+            if progress_callback:
+                progress_callback(saved, total, f"Saved {saved}/{total} commits")
+
+            print(f"[Commit Analyzer] Saved {saved}/{total} commits...")
 
         print(f"[Commit Analyzer] ✓ Completed analysis of {total} commits")
 
@@ -1,8 +1,9 @@
 """Analyzer for issue metrics."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from database import DatabaseManager
 from llm import OpenAIClient
+from utils.metrics import description_cache_key
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
@@ -14,89 +15,132 @@ class IssueAnalyzer:
         self.db = db_manager
         self.llm = llm_client
 
-    def _analyze_single_issue(self, repo_id: int, issue_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze a single issue (used for parallel processing).
+    def _description_key(self, title: str, body: str) -> str:
+        """Build the cache key for an issue description."""
+        return description_cache_key("issue", self.llm.model, title, body)
+
+    def _analyze_single_issue(self, key: str, title: str, body: str) -> Dict[str, Any]:
+        """Score a single issue description (used for parallel processing).
+
+        Workers only call the LLM; results are saved in bulk by the caller.
 
         Args:
-            repo_id: Repository ID
-            issue_data: Issue data from GitHub API
+            key: Cache key of the description
+            title: Issue title
+            body: Issue body
 
         Returns:
             Dict with analysis results
         """
         try:
-            # Get or create contributor
-            contributor = self.db.get_or_create_contributor(
-                issue_data["contributor"])
-
-            # Save issue
-            issue_record = self.db.save_issue({
-                "repo_id": repo_id,
-                "contributor_id": contributor.id,
-                "issue_number": issue_data["issue_number"],
-                "title": issue_data["title"],
-                "body": issue_data["body"],
-                "state": issue_data["state"],
-                "assignees": issue_data["assignees"],
-                "labels": issue_data["labels"],
-                "comments_count": issue_data["comments_count"],
-                "created_at": issue_data["created_at"],
-                "closed_at": issue_data["closed_at"],
-            })
-
             # Analyze issue description quality with LLM
-            quality_analysis = self.llm.analyze_issue_description(
-                issue_data["title"], issue_data["body"])
-
-            # Save issue metrics
-            self.db.save_issue_metric({
-                "issue_id": issue_record.id,
-                "description_quality_score": quality_analysis["score"],
-                "description_quality_feedback": quality_analysis["feedback"],
-            })
+            quality_analysis = self.llm.analyze_issue_description(title, body)
 
-            return {"success": True, "issue_number": issue_data["issue_number"]}
+            return {
+                "success": True,
+                "key": key,
+                "score": quality_analysis["score"],
+                "feedback": quality_analysis["feedback"],
+                "llm_error": quality_analysis.get("error", False),
+            }
         except Exception as e:
-            return {"success": False, "issue_number": issue_data["issue_number"], "error": str(e)}
+            return {"success": False, "key": key, "error": str(e)}
 
-    def analyze_issues(self, repo_id: int, issues: List[Dict[str, Any]], progress_callback=None, max_workers: int = 30):
+    def analyze_issues(self, repo_id: int, issues: List[Dict[str, Any]], progress_callback=None, max_workers: int = 30,
+                       contributor_ids: Optional[Dict[str, int]] = None):
         """Analyze issues and store metrics with parallel processing.
 
+        Contributors and issues are saved in bulk first, the LLM scoring runs
+        per distinct uncached description on the thread pool, and the metrics
+        are saved in bulk at the end.
+
         Args:
             repo_id: Repository ID
             issues: List of issue data from GitHub API
             progress_callback: Optional callback for progress updates
-            max_workers: Number of parallel workers for LLM analysis (default: 5)
+            max_workers: Number of parallel workers for LLM analysis (default: 30)
+            contributor_ids: Optional username -> contributor id map already
+                resolved for this run; built here if not provided
         """
         total = len(issues)
         print(
             f"[Issue Analyzer] Starting parallel analysis of {total} issues with {max_workers} workers...")
 
+        # Resolve every author to a contributor id up front
+        if contributor_ids is None:
+            contributor_ids = self.db.get_or_create_contributors(
+                [issue_data["contributor"] for issue_data in issues])
+
+        issue_ids = self.db.save_issues_bulk(repo_id, [{
+            "repo_id": repo_id,
+            "contributor_id": contributor_ids.get(issue_data["contributor"]["username"]),
+            "issue_number": issue_data["issue_number"],
+            "title": issue_data["title"],
+            "body": issue_data["body"],
+            "state": issue_data["state"],
+            "assignees": issue_data["assignees"],
+            "labels": issue_data["labels"],
+            "comments_count": issue_data["comments_count"],
+            "created_at": issue_data["created_at"],
+            "closed_at": issue_data["closed_at"],
+        } for issue_data in issues])
+
+        # Distinct descriptions are scored once; repeats across runs come from the LLM cache
+        issue_keys = {}
+        unique = {}
+        for issue_data in issues:
+            key = self._description_key(issue_data["title"], issue_data["body"])
+            issue_keys[issue_data["issue_number"]] = key
+            unique.setdefault(key, (issue_data["title"], issue_data["body"]))
+
+        analyses = self.db.get_llm_cache_many(list(unique))
+        misses = [(key, title, body) for key, (title, body) in unique.items() if key not in analyses]
+
+        print(
+            f"[Issue Analyzer] {len(unique) - len(misses)} of {len(unique)} distinct descriptions cached, "
+            f"scoring {len(misses)}...")
+
         completed = 0
+        scored = {}
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit all issue analysis tasks
-            future_to_issue = {
-                executor.submit(self._analyze_single_issue, repo_id, issue_data): issue_data
-                for issue_data in issues
-            }
+            futures = [executor.submit(self._analyze_single_issue, *miss) for miss in misses]
 
             # Process results as they complete
-            for future in as_completed(future_to_issue):
+            for future in as_completed(futures):
                 completed += 1
                 result = future.result()
 
                 if progress_callback:
-                    issue_data = future_to_issue[future]
                     progress_callback(
-                        completed, total, f"Analyzing issue #{issue_data['issue_number']}")
+                        completed, len(misses), f"Analyzed {completed}/{len(misses)} issue descriptions")
 
                 if completed % 10 == 0:
                     print(
-                        f"[Issue Analyzer] Analyzed {completed}/{total} issues...")
+                        f"[Issue Analyzer] Analyzed {completed}/{len(misses)} issues...")
 
-                if not result["success"]:
+                if result["success"]:
+                    analyses[result["key"]] = {"score": result["score"], "feedback": result["feedback"]}
+                    if not result["llm_error"]:
+                        scored[result["key"]] = analyses[result["key"]]
+                else:
                     print(
-                        f"[Issue Analyzer] Warning: Failed to analyze issue #{result['issue_number']}: {result.get('error', 'Unknown error')}")
+                        f"[Issue Analyzer] Warning: Failed to analyze issue description: {result.get('error', 'Unknown error')}")
+
+        # Only successful LLM verdicts are cached, errors are retried next run
+        self.db.save_llm_cache_many(self.llm.model, scored)
+
+        metrics = []
+        for issue_number, key in issue_keys.items():
+            analysis = analyses.get(key)
+            if analysis:
+                metrics.append({
+                    "issue_id": issue_ids[issue_number],
+                    "description_quality_score": analysis["score"],
+                    "description_quality_feedback": analysis["feedback"],
+                })
+
+        self.db.save_issue_metrics_bulk(metrics)
 
         print(f"[Issue Analyzer] ✓ Completed analysis of {total} issues")
 
@@ -1,11 +1,17 @@
 """Analyzer for pull request metrics."""
 
 import json
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 from database import DatabaseManager
 from llm import OpenAIClient
-from utils.metrics import check_pr_links_issue
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.metrics import check_pr_links_issue, description_cache_key, heuristic_description_score
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+# Consecutive failed LLM batches after which the rest of the run is scored heuristically
+LLM_FAILURE_LIMIT = 3
 
 
 class PRAnalyzer:
@@ -15,123 +21,254 @@ class PRAnalyzer:
         """Initialize the PR analyzer."""
         self.db = db_manager
         self.llm = llm_client
+        self._llm_failures = 0
+        self._llm_succeeded = False
+        self._llm_failures_lock = threading.Lock()
+
+    def _description_key(self, title: str, body: str) -> str:
+        """Build the cache key for a PR description."""
+        return description_cache_key("pr", self.llm.model, title, body)
+
+    def _score_description_batch(self, batch: List[Tuple[str, str, str]]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Score a batch of PR descriptions with a single LLM request.
 
-    def _analyze_single_pr(self, repo_id: int, pr_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze a single pull request (used for parallel processing).
+        Runs on the LLM thread pool, so it only talks to the LLM; the caller
+        writes the returned verdicts to the cache.
+
+        Args:
+            batch: List of (cache key, title, body) tuples
+
+        Returns:
+            Tuple of (analyses, scored): both map cache key to a dict with 'score'
+            and 'feedback'; analyses covers the whole batch including heuristic
+            fallbacks, scored only the LLM verdicts worth caching
+        """
+        results = self.llm.analyze_pr_descriptions_batch(
+            [(title, body) for _, title, body in batch])
+
+        analyses = {}
+        scored = {}
+        for (key, title, body), result in zip(batch, results):
+            if result.get("error"):
+                analyses[key] = self._heuristic_analysis(title, body)
+            else:
+                analyses[key] = scored[key] = result
+
+        with self._llm_failures_lock:
+            if scored:
+                self._llm_failures = 0
+                self._llm_succeeded = True
+            else:
+                self._llm_failures += 1
+                if self._llm_failures == LLM_FAILURE_LIMIT:
+                    print(
+                        f"[PR Analyzer] LLM failed {LLM_FAILURE_LIMIT} batches in a row, "
+                        f"falling back to heuristic scoring")
+
+        return analyses, scored
+
+    @staticmethod
+    def _heuristic_analysis(title: str, body: str) -> Dict[str, Any]:
+        """Score a PR description locally when the LLM is unavailable."""
+        return {
+            "score": heuristic_description_score(title, body),
+            "feedback": "Heuristic score (LLM unavailable): based on description length, "
+                        "structure, linked issues and testing notes.",
+        }
+
+    def _score_descriptions(self, prs: List[Dict[str, Any]], progress_callback=None,
+                            max_workers: int = 30, batch_size: int = 10) -> Dict[str, Dict[str, Any]]:
+        """Score every distinct PR description, using the cache and batched LLM requests.
+
+        Descriptions are compared after lowercasing and collapsing whitespace,
+        so duplicates within a run are scored once and repeats across runs are
+        read from the cache.
+
+        Args:
+            prs: List of PR data from GitHub API
+            progress_callback: Optional callback for progress updates
+            max_workers: Number of concurrent LLM requests
+            batch_size: Number of descriptions sent per LLM request
+
+        Returns:
+            Dict mapping cache key to a dict with 'score' and 'feedback'
+        """
+        unique = {}
+        for pr_data in prs:
+            key = self._description_key(pr_data["title"], pr_data["body"])
+            unique.setdefault(key, (pr_data["title"], pr_data["body"]))
+
+        analyses = self.db.get_llm_cache_many(list(unique))
+        misses = [(key, title, body) for key, (title, body) in unique.items() if key not in analyses]
+
+        print(
+            f"[PR Analyzer] {len(unique) - len(misses)} of {len(unique)} distinct descriptions cached, "
+            f"scoring {len(misses)} in batches of {batch_size}...")
+
+        batches = deque(misses[start:start + batch_size] for start in range(0, len(misses), batch_size))
+        scored = 0
+        llm_verdicts = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            while batches or pending:
+                # Batches are submitted as slots free up so the breaker is checked before each one.
+                # Until a batch has succeeded only LLM_FAILURE_LIMIT are in flight, so an unavailable
+                # LLM costs at most that many failed requests before the breaker trips
+                with self._llm_failures_lock:
+                    circuit_open = self._llm_failures >= LLM_FAILURE_LIMIT
+                    in_flight = max_workers if self._llm_succeeded else min(max_workers, LLM_FAILURE_LIMIT)
+
+                if circuit_open and batches:
+                    remaining = [item for batch in batches for item in batch]
+                    batches.clear()
+                    analyses.update({key: self._heuristic_analysis(title, body)
+                                     for key, title, body in remaining})
+                    scored += len(remaining)
+
+                while batches and len(pending) < in_flight:
+                    pending.add(executor.submit(self._score_description_batch, batches.popleft()))
+
+                if pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        batch_analyses, batch_verdicts = future.result()
+                        analyses.update(batch_analyses)
+                        llm_verdicts.update(batch_verdicts)
+                        scored += len(batch_analyses)
+
+                if progress_callback:
+                    progress_callback(scored, len(misses), "Scoring PR descriptions")
+
+        # Only LLM verdicts are cached, heuristic fallbacks are retried next run.
+        # Written once here so the pool threads never touch the database
+        self.db.save_llm_cache_many(self.llm.model, llm_verdicts)
+
+        return analyses
+
+    def _save_pull_requests(self, repo_id: int, prs: List[Dict[str, Any]],
+                            contributor_ids: Dict[str, int], batch_size: int) -> Dict[int, int]:
+        """Save PR records in bulk, batch_size rows per transaction.
 
         Args:
             repo_id: Repository ID
-            pr_data: PR data from GitHub API
+            prs: List of PR data from GitHub API
+            contributor_ids: Username -> contributor id map
+            batch_size: Number of PRs written per transaction
 
         Returns:
-            Dict with analysis results
+            Dict mapping PR number to pull request id
         """
-        try:
-            # Get or create contributor
-            contributor = self.db.get_or_create_contributor(
-                pr_data["contributor"])
-
-            # Get or create merged_by contributor if exists
-            merged_by_id = None
-            if pr_data.get("merged_by"):
-                merged_by_contributor = self.db.get_or_create_contributor(
-                    pr_data["merged_by"])
-                merged_by_id = merged_by_contributor.id
-
-            # Convert approvers list to JSON string
-            approvers = pr_data.get("approvers", [])
-            approvers_json = json.dumps(approvers) if approvers else None
-
-            # Save PR
-            pr_record = self.db.save_pull_request({
-                "repo_id": repo_id,
-                "contributor_id": contributor.id,
-                "merged_by_id": merged_by_id,
-                "pr_number": pr_data["pr_number"],
-                "title": pr_data["title"],
-                "body": pr_data["body"],
-                "state": pr_data["state"],
-                "comments_count": pr_data["comments_count"],  # Combined total
-                "additions": pr_data["additions"],
-                "deletions": pr_data["deletions"],
-                "created_at": pr_data["created_at"],
-                "merged_at": pr_data["merged_at"],
-                "closed_at": pr_data["closed_at"],
-                "approvers": approvers_json,
-            })
-
-            # Analyze PR description quality with LLM
-            quality_analysis = self.llm.analyze_pr_description(
-                pr_data["title"], pr_data["body"])
-
-            # Check if PR links to an issue
-            links_issue = check_pr_links_issue(
-                pr_data["body"], pr_data["title"])
-
-            # Calculate average comment length (simplified for now)
-            # In a more detailed version, we'd fetch actual comments
-            avg_comment_len = 0.0
-
-            # Save PR metrics
-            self.db.save_pr_metric({
-                "pr_id": pr_record.id,
-                "description_quality_score": quality_analysis["score"],
-                "description_quality_feedback": quality_analysis["feedback"],
-                "linked_to_issue": links_issue,
-                "avg_comment_length": avg_comment_len,
-            })
-
-            return {"success": True, "pr_number": pr_data["pr_number"]}
-        except Exception as e:
-            return {"success": False, "pr_number": pr_data["pr_number"], "error": str(e)}
-
-    def analyze_pull_requests(self, repo_id: int, prs: List[Dict[str, Any]], progress_callback=None, max_workers: int = 30):
-        """Analyze pull requests and store metrics with parallel processing.
+        pr_ids = {}
+
+        for start in range(0, len(prs), batch_size):
+            pr_rows = []
+            for pr_data in prs[start:start + batch_size]:
+                # Convert approvers list to JSON string
+                approvers = pr_data.get("approvers", [])
+                merged_by = pr_data.get("merged_by")
+
+                pr_rows.append({
+                    "repo_id": repo_id,
+                    "contributor_id": contributor_ids.get(pr_data["contributor"]["username"]),
+                    "merged_by_id": contributor_ids.get(merged_by["username"]) if merged_by else None,
+                    "pr_number": pr_data["pr_number"],
+                    "title": pr_data["title"],
+                    "body": pr_data["body"],
+                    "state": pr_data["state"],
+                    "comments_count": pr_data["comments_count"],  # Combined total
+                    "additions": pr_data["additions"],
+                    "deletions": pr_data["deletions"],
+                    "created_at": pr_data["created_at"],
+                    "merged_at": pr_data["merged_at"],
+                    "closed_at": pr_data["closed_at"],
+                    "approvers": json.dumps(approvers) if approvers else None,
+                })
+
+            pr_ids.update(self.db.save_pull_requests_bulk(repo_id, pr_rows))
+
+        print(f"[PR Analyzer] Saved {len(pr_ids)} pull requests")
+        return pr_ids
+
+    def analyze_pull_requests(self, repo_id: int, prs: List[Dict[str, Any]], progress_callback=None,
+                              max_workers: int = 30, batch_size: int = 500,
+                              contributor_ids: Optional[Dict[str, int]] = None):
+        """Analyze pull requests and store metrics.
+
+        PR rows don't depend on the LLM, so they are written by a single
+        database worker while descriptions are scored in batched LLM requests
+        on the thread pool. Metrics are then written in bulk on the calling
+        thread, batch_size rows per transaction.
 
         Args:
             repo_id: Repository ID
             prs: List of PR data from GitHub API
             progress_callback: Optional callback for progress updates
-            max_workers: Number of parallel workers for LLM analysis (default: 5)
+            max_workers: Number of parallel workers for LLM analysis (default: 30)
+            batch_size: Number of PRs written per transaction (default: 500)
+            contributor_ids: Optional username -> contributor id map already
+                resolved for this run; built here if not provided
         """
         total = len(prs)
         print(
             f"[PR Analyzer] Starting parallel analysis of {total} pull requests with {max_workers} workers...")
 
-        completed = 0
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all PR analysis tasks
-            future_to_pr = {
-                executor.submit(self._analyze_single_pr, repo_id, pr_data): pr_data
-                for pr_data in prs
-            }
+        # Resolve every author and merger to a contributor id up front
+        if contributor_ids is None:
+            contributor_ids = self.db.get_or_create_contributors(
+                [pr_data["contributor"] for pr_data in prs] +
+                [pr_data["merged_by"] for pr_data in prs if pr_data.get("merged_by")])
 
-            # Process results as they complete
-            for future in as_completed(future_to_pr):
-                completed += 1
-                result = future.result()
+        # Progress callbacks stay on this thread; the database worker only writes
+        with ThreadPoolExecutor(max_workers=1) as db_executor:
+            pr_ids_future = db_executor.submit(
+                self._save_pull_requests, repo_id, prs, contributor_ids, batch_size)
+            analyses = self._score_descriptions(prs, progress_callback, max_workers)
+            pr_ids = pr_ids_future.result()
 
-                if progress_callback:
-                    pr_data = future_to_pr[future]
-                    progress_callback(completed, total,
-                                      f"Analyzing PR #{pr_data['pr_number']}")
+        for start in range(0, total, batch_size):
+            batch = prs[start:start + batch_size]
 
-                if completed % 10 == 0:
-                    print(
-                        f"[PR Analyzer] Analyzed {completed}/{total} pull requests...")
+            metric_rows = []
+            for pr_data in batch:
+                quality_analysis = analyses[self._description_key(
+                    pr_data["title"], pr_data["body"])]
 
-                if not result["success"]:
-                    print(
-                        f"[PR Analyzer] Warning: Failed to analyze PR #{result['pr_number']}: {result.get('error', 'Unknown error')}")
+                metric_rows.append({
+                    "pr_id": pr_ids[pr_data["pr_number"]],
+                    "description_quality_score": quality_analysis["score"],
+                    "description_quality_feedback": quality_analysis["feedback"],
+                    "linked_to_issue": check_pr_links_issue(pr_data["body"], pr_data["title"]),
+                    # Average comment length is not computed yet
+                    "avg_comment_length": 0.0,
+                })
+
+            self.db.save_pr_metrics_bulk(metric_rows)
+
+            saved = start + len(batch)
+            if progress_callback:
+                progress_callback(saved, total, f"Saved {saved}/{total} pull requests")
+
+            print(f"[PR Analyzer] Saved metrics for {saved}/{total} pull requests...")
 
         print(f"[PR Analyzer] ✓ Completed analysis of {total} pull requests")
 
-    def get_pr_statistics(self, repo_id: int) -> Dict[str, Any]:
-        """Get aggregate PR statistics for a repository."""
-        session = self.db.get_session()
+    def get_pr_statistics(self, repo_id: int, session=None) -> Dict[str, Any]:
+        """Get aggregate PR statistics for a repository.
+
+        Args:
+            repo_id: Database ID of the repository
+            session: Optional open session to run the query on, so callers reading
+                several statistics can share one connection. It is left open.
+
+        Returns:
+            Dict with PR totals, averages and issue-link percentage
+        """
+        owns_session = session is None
+        if owns_session:
+            session = self.db.get_session()
         try:
             from database.models import PullRequest, PRMetric
-            from sqlalchemy import func, Integer
+            from sqlalchemy import func, case
 
             # Get basic stats
             stats = session.query(
@@ -141,7 +278,7 @@ class PRAnalyzer:
                 func.avg(PullRequest.comments_count).label("avg_comments"),
                 func.avg(PRMetric.description_quality_score).label(
                     "avg_description_quality"),
-                func.sum(func.cast(PRMetric.linked_to_issue, Integer)
+                func.sum(case((PRMetric.linked_to_issue.is_(True), 1), else_=0)
                          ).label("prs_with_issues"),
             ).outerjoin(
                 PRMetric, PullRequest.id == PRMetric.pr_id
@@ -162,4 +299,5 @@ class PRAnalyzer:
                 "percentage_linked": round((prs_with_issues / total_prs) * 100, 1) if total_prs > 0 else 0,
             }
         finally:
-            session.close()
+            if owns_session:
+                session.close()
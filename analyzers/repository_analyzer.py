@@ -1,37 +1,327 @@
 """Combined analyzer for repository content and code quality - fully in-memory."""
 
-import json
+import ast
+import bisect
+import heapq
 import io
-from typing import Dict, Any, List, Optional, Callable
-from collections import defaultdict
+import json
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from hashlib import blake2b, sha1
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import BinaryIO, Dict, Any, List, Optional, Callable, Tuple
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+logger = logging.getLogger(__name__)
 
 try:
-    from git import Repo, GitCommandError
-    GIT_PYTHON_AVAILABLE = True
+    from radon.metrics import h_visit_ast, mi_compute
+    from radon.raw import analyze as raw_analyze
+    from radon.visitors import ComplexityVisitor
+    RADON_AVAILABLE = True
 except ImportError:
-    GIT_PYTHON_AVAILABLE = False
-    print("[Repository Analyzer] Warning: GitPython not available")
+    RADON_AVAILABLE = False
+    logger.warning("[Repository Analyzer] Radon not available for code quality analysis")
 
 try:
-    from radon.complexity import cc_visit
-    from radon.metrics import mi_visit
-    RADON_AVAILABLE = True
+    import resource
+    RESOURCE_AVAILABLE = hasattr(resource, "prlimit")
 except ImportError:
-    RADON_AVAILABLE = False
-    print("[Repository Analyzer] Warning: Radon not available for code quality analysis")
+    RESOURCE_AVAILABLE = False
 
 try:
-    from pylint import epylint
-    from pylint.lint import PyLinter
-    from pylint.reporters.text import TextReporter
-    import io
+    import pylint  # noqa: F401 - run as a subprocess, imported only to check availability
     PYLINT_AVAILABLE = True
 except ImportError:
     PYLINT_AVAILABLE = False
-    print("[Repository Analyzer] Warning: Pylint not available for code analysis")
+    logger.warning("[Repository Analyzer] Pylint not available for code analysis")
 
 # Pytest removed - requires file system access, incompatible with in-memory analysis
 
+# Shared HTTP session so repeated analyses reuse keep-alive connections to GitHub
+_http_session = requests.Session()
+_http_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+# Bump when analysis logic changes so results stored for an unchanged commit are recomputed
+ANALYZER_VERSION = "2"
+
+# GitHub serves a gzipped tarball of any ref without going through the git protocol
+CODELOAD_TARBALL_URL = "https://codeload.github.com/{owner}/{repo}/tar.gz/HEAD"
+
+# Smart-HTTP ref advertisement, used to read the HEAD commit SHA in a single request
+GIT_INFO_REFS_URL = "https://github.com/{owner}/{repo}.git/info/refs?service=git-upload-pack"
+
+# analyze_repository results keyed by (repository, commit SHA, include_file_details).
+# A SHA never changes content, so entries only need an LRU bound rather than a TTL.
+CONTENT_CACHE_SIZE = 32
+_content_cache: "OrderedDict[Tuple[str, str, bool], Dict[str, Any]]" = OrderedDict()
+_content_cache_lock = threading.Lock()
+
+# Upper bound in seconds for the single batched pylint run
+PYLINT_TIMEOUT = 300
+
+# Address space cap per pylint process (each -j worker gets its own)
+PYLINT_MEMORY_LIMIT = 2 * 1024 ** 3
+
+# Put the pylint scratch directory on tmpfs when available, so the sources never hit disk
+SCRATCH_PARENT_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+# Removes pylint scratch directories in the background once results are read
+_cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scratch-cleanup")
+
+# Per-file radon results keyed by git blob SHA, so unchanged or vendored files are not
+# re-parsed on later analyses. None is cached too, for files that failed to parse.
+FILE_RESULTS_CACHE_SIZE = 20000
+_file_results_cache: "OrderedDict[str, Optional[Dict[str, Any]]]" = OrderedDict()
+_file_results_lock = threading.Lock()
+
+# Read size when counting lines of archive members whose contents are not kept
+LINE_COUNT_CHUNK_SIZE = 64 * 1024
+
+# Below this many Python files, process startup costs more than it saves
+PARALLEL_MIN_FILES = 50
+
+# Streamlit runs analyses on threads, and forking a multi-threaded process can copy
+# held locks into the child, so worker processes are started from a clean interpreter
+_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+# LLM insights keyed by a fingerprint of the metrics in the prompt.
+# Kept in process memory only, since analysis must not depend on the local file system.
+INSIGHTS_CACHE_TTL = 30 * 86400
+_insights_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_insights_cache_lock = threading.Lock()
+
+# Static instructions are kept identical across calls so the prompt prefix can be cached
+INSIGHTS_SYSTEM_PROMPT = """You are a code quality expert analyzing repository metrics.
+
+Given a repository's code quality metrics, provide:
+1. A brief summary of overall code quality (2-3 sentences)
+2. Top 3 specific improvement suggestions
+3. A best practices score from 0-10
+
+Respond in JSON format with:
+{"summary": "...", "suggestions": ["...", "...", "..."], "score": 7.5}"""
+
+# Grade lookup tables: upper bounds for complexity, lower bounds for maintainability
+_CC_THRESHOLDS = (5, 10, 20, 30, 40)
+_CC_GRADES = ("A", "B", "C", "D", "E", "F")
+_MI_THRESHOLDS = (0, 10, 20)
+_MI_GRADES = ("F", "C", "B", "A")
+
+
+def _complexity_grade(complexity: float) -> str:
+    """Convert an average cyclomatic complexity to a letter grade."""
+    return _CC_GRADES[bisect.bisect_left(_CC_THRESHOLDS, complexity)]
+
+
+def _maintainability_grade(mi: float) -> str:
+    """Convert an average maintainability index to a letter grade."""
+    return _MI_GRADES[bisect.bisect_right(_MI_THRESHOLDS, mi)]
+
+# Thresholds for the built-in code smell checks
+MAX_FUNCTION_LINES = 50
+MAX_FUNCTION_ARGS = 5
+
+
+def _find_code_smells(tree: ast.AST) -> List[Dict[str, Any]]:
+    """Detect common code smells in a parsed module.
+
+    Args:
+        tree: Module AST
+
+    Returns:
+        List of dicts with 'code', 'line' and 'message'
+    """
+    smells = []
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            length = (node.end_lineno or node.lineno) - node.lineno + 1
+            if length > MAX_FUNCTION_LINES:
+                smells.append({
+                    "code": "long-function",
+                    "line": node.lineno,
+                    "message": f"{node.name} is {length} lines long"
+                })
+
+            args = node.args
+            positional = args.posonlyargs + args.args
+            arg_count = len(positional) + len(args.kwonlyargs)
+            if positional and positional[0].arg in ('self', 'cls'):
+                arg_count -= 1
+            if arg_count > MAX_FUNCTION_ARGS:
+                smells.append({
+                    "code": "too-many-arguments",
+                    "line": node.lineno,
+                    "message": f"{node.name} takes {arg_count} arguments"
+                })
+
+            for default in args.defaults + [d for d in args.kw_defaults if d is not None]:
+                if isinstance(default, (ast.List, ast.Dict, ast.Set)):
+                    smells.append({
+                        "code": "mutable-default",
+                        "line": default.lineno,
+                        "message": f"{node.name} has a mutable default argument"
+                    })
+
+        elif isinstance(node, ast.ExceptHandler) and node.type is None:
+            smells.append({
+                "code": "bare-except",
+                "line": node.lineno,
+                "message": "Bare except clause"
+            })
+
+    return smells
+
+
+def _maintainability_index(source_code: str, tree: ast.AST, total_complexity: int) -> float:
+    """Compute radon's maintainability index from an already parsed module.
+
+    Equivalent to ``mi_visit(source_code, multi=True)``, which would parse the
+    source again and rerun the complexity visitor.
+
+    Args:
+        source_code: Decoded file source, needed for the raw line metrics
+        tree: Module AST parsed from source_code
+        total_complexity: Total cyclomatic complexity from ComplexityVisitor
+
+    Returns:
+        Maintainability index from 0 to 100
+    """
+    raw = raw_analyze(source_code)
+    comment_lines = raw.comments + raw.multi
+    comments = comment_lines / float(raw.sloc) * 100 if raw.sloc != 0 else 0
+    return mi_compute(h_visit_ast(tree).total.volume, total_complexity, raw.lloc, comments)
+
+
+def _analyze_one_file(path: str, content: bytes) -> Optional[Dict[str, Any]]:
+    """Compute radon complexity, maintainability and code smells for a single Python file.
+
+    Defined at module level so it can be pickled into worker processes. Per-file
+    totals are reduced here so the parent only sums a few numbers per file.
+
+    Args:
+        path: File path within the repository
+        content: Raw file bytes
+
+    Returns:
+        Dict with per-function complexities, complexity totals, maintainability
+        index and code smells, or None if the file can't be parsed
+    """
+    # Binary content can't be Python source, skip it before decoding
+    if b'\x00' in content[:4096]:
+        return None
+
+    try:
+        # A stray non-UTF-8 byte (usually in a comment or string) shouldn't drop the file
+        source_code = content.decode('utf-8', errors='replace')
+        tree = ast.parse(source_code)
+        visitor = ComplexityVisitor.from_ast(tree)
+        results = visitor.blocks
+        mi_score = _maintainability_index(source_code, tree, visitor.total_complexity)
+        smells = _find_code_smells(tree)
+    except Exception:
+        return None
+
+    file_complexities = []
+    complexity_total = 0
+    high_complexity = 0
+    for result in results:
+        complexity = result.complexity
+        complexity_total += complexity
+        if complexity > 10:
+            high_complexity += 1
+
+        file_complexities.append({
+            'name': result.name,
+            'type': result.letter,
+            'complexity': complexity,
+            'lineno': result.lineno
+        })
+
+    return {
+        "path": path,
+        "complexities": file_complexities,
+        "complexity_total": complexity_total,
+        "high_complexity": high_complexity,
+        "mi": mi_score,
+        "smells": smells,
+    }
+
+
+def _blob_sha(content: bytes) -> str:
+    """Return the git blob SHA-1 of file content, the same for identical bytes in any repository."""
+    return sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def _count_lines(fileobj: BinaryIO) -> Optional[int]:
+    """Count the lines of a file in fixed-size chunks, without holding it in memory.
+
+    Newlines are counted on the raw bytes; a newline is b'\\n' in utf-8 and
+    latin-1 alike, so there is no need to decode first.
+
+    Args:
+        fileobj: Binary file object positioned at the start of the file
+
+    Returns:
+        Number of lines, or None for a binary file (a NUL byte near the start)
+    """
+    chunk = fileobj.read(LINE_COUNT_CHUNK_SIZE)
+    if b'\x00' in chunk[:4096]:
+        return None
+
+    lines = 0
+    last = b'\n'
+    while chunk:
+        lines += chunk.count(b'\n')
+        last = chunk[-1:]
+        chunk = fileobj.read(LINE_COUNT_CHUNK_SIZE)
+    # A final line without a trailing newline still counts
+    return lines + (last != b'\n')
+
+
+def _lookup_file_result(key: str, path: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """Look up a cached per-file result by blob SHA.
+
+    Args:
+        key: Blob SHA from _blob_sha
+        path: Path to report the cached result under
+
+    Returns:
+        Tuple of (hit, result); the result is None on a miss or for files that
+        could not be parsed
+    """
+    with _file_results_lock:
+        if key not in _file_results_cache:
+            return False, None
+        _file_results_cache.move_to_end(key)
+        cached = _file_results_cache[key]
+    return True, None if cached is None else {**cached, "path": path}
+
+
+def _store_file_result(key: str, result: Optional[Dict[str, Any]]):
+    """Cache a per-file result by blob SHA, dropping the least recently used entries."""
+    with _file_results_lock:
+        _file_results_cache[key] = None if result is None else {
+            name: value for name, value in result.items() if name != "path"}
+        while len(_file_results_cache) > FILE_RESULTS_CACHE_SIZE:
+            _file_results_cache.popitem(last=False)
+
 
 class RepositoryAnalyzer:
     """Analyzes repository content, structure, and code quality metrics - entirely in memory."""
@@ -76,23 +366,38 @@ class RepositoryAnalyzer:
     }
 
     # Extensions to ignore
-    IGNORE_EXTENSIONS = {
+    IGNORE_EXTENSIONS = frozenset({
         '.pyc', '.pyo', '.pyd', '.so', '.dll', '.dylib', '.exe',
         '.jpg', '.jpeg', '.png', '.gif', '.svg', '.ico', '.bmp',
         '.mp3', '.mp4', '.avi', '.mov', '.wav',
         '.zip', '.tar', '.gz', '.rar', '.7z',
         '.pdf', '.doc', '.docx', '.xls', '.xlsx',
         '.lock', '.log', '.tmp', '.cache',
-    }
+    })
 
     # Directories to ignore
-    IGNORE_DIRS = {
+    IGNORE_DIRS = frozenset({
         '__pycache__', '.git', '.svn', '.hg', 'node_modules',
         'venv', 'env', 'ENV', '.venv', 'virtualenv',
-        'build', 'dist', '.egg-info', 'target',
-        '.pytest_cache', '.mypy_cache', '.tox',
+        'build', 'dist', '.eggs', 'target', 'site-packages',
+        '.pytest_cache', '.mypy_cache', '.tox', '.nox',
         'coverage', '.coverage', 'htmlcov',
-    }
+    })
+
+    # Directory name suffixes to ignore (e.g. 'mypkg.egg-info')
+    IGNORE_DIR_SUFFIXES = ('.egg-info',)
+
+    # Generated files to ignore
+    IGNORE_FILE_SUFFIXES = ('_pb2.py', '_pb2_grpc.py')
+
+    # All of the above in one pattern, so each path is checked in a single regex scan
+    _IGNORE_PATH_RE = re.compile(
+        r'(?:^|/)(?:'
+        + '|'.join(re.escape(name) for name in sorted(IGNORE_DIRS))
+        + '|' + '|'.join(r'[^/]*' + re.escape(suffix) for suffix in IGNORE_DIR_SUFFIXES)
+        + r')(?:/|$)'
+        + r'|(?:' + '|'.join(re.escape(suffix) for suffix in IGNORE_FILE_SUFFIXES) + r')$'
+    )
 
     def __init__(self, llm_client=None):
         """Initialize the repository analyzer.
@@ -111,8 +416,7 @@ class RepositoryAnalyzer:
         Returns:
             True if path should be ignored
         """
-        parts = path.split('/')
-        return any(part in self.IGNORE_DIRS for part in parts)
+        return self._IGNORE_PATH_RE.search(path) is not None
 
     def _get_file_extension(self, filename: str) -> str:
         """Get file extension in lowercase.
@@ -123,150 +427,211 @@ class RepositoryAnalyzer:
         Returns:
             File extension including the dot (e.g., '.py')
         """
-        if '.' not in filename:
-            return ''
-        return '.' + filename.rsplit('.', 1)[1].lower()
+        dot = filename.rfind('.')
+        return filename[dot:].lower() if dot != -1 else ''
+
+    def _parse_repo_url(self, repo_url: str) -> Optional[Tuple[str, str]]:
+        """Extract owner and repository name from a GitHub URL.
+
+        Args:
+            repo_url: GitHub repository URL
+
+        Returns:
+            Tuple of (owner, repo_name) or None if the URL is not a GitHub URL
+        """
+        match = re.search(r"github\.com/([^/]+)/([^/?#]+)", repo_url)
+        if not match:
+            return None
+        owner, repo_name = match.groups()
+        if repo_name.endswith('.git'):
+            repo_name = repo_name[:-4]
+        return owner, repo_name
+
+    def get_head_sha(self, repo_url: str) -> Optional[str]:
+        """Look up the commit SHA that HEAD points to without downloading anything else.
 
-    def clone_repository_in_memory(self, repo_url: str) -> Optional[Repo]:
-        """Clone a repository into memory for analysis.
+        Reads the smart-HTTP ref advertisement (the same request git ls-remote
+        makes), where the first ref line is "<sha> HEAD\\0<capabilities>".
 
         Args:
-            repo_url: Git URL of the repository
+            repo_url: GitHub repository URL
 
         Returns:
-            Repo object or None if failed
+            The 40-character commit SHA, or None if it could not be determined
         """
-        if not GIT_PYTHON_AVAILABLE:
-            print("[Repository Analyzer] ✗ GitPython not available")
+        parsed = self._parse_repo_url(repo_url)
+        if not parsed:
             return None
 
+        owner, repo_name = parsed
         try:
-            print(f"[Repository Analyzer] Cloning repository into memory...")
-            # Convert GitHub URL to git URL if needed
-            if 'github.com' in repo_url and not repo_url.endswith('.git'):
-                if not repo_url.startswith('http'):
-                    repo_url = f"https://{repo_url}"
-                if not repo_url.endswith('.git'):
-                    repo_url = f"{repo_url}.git"
-
-            # Clone with minimal depth for faster download
-            # Note: GitPython still writes to disk, but we'll minimize it
-            import tempfile
-            temp_dir = tempfile.mkdtemp(prefix="repo_analysis_")
-
-            repo = Repo.clone_from(
-                repo_url,
-                temp_dir,
-                depth=1,
-                single_branch=True
-            )
-            print(f"[Repository Analyzer] ✓ Repository cloned successfully")
-            return repo
+            response = _http_session.get(
+                GIT_INFO_REFS_URL.format(owner=owner, repo=repo_name), timeout=15)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning("[Repository Analyzer] ✗ Could not resolve HEAD: %s", e)
+            return None
+
+        match = re.search(rb"([0-9a-f]{40}) HEAD\x00", response.content)
+        return match.group(1).decode() if match else None
+
+    def fetch_repository_snapshot(self, repo_url: str,
+                                  on_file: Optional[Callable[[str, bytes], None]] = None) -> Optional[Dict[str, Any]]:
+        """Download the HEAD snapshot of a repository into memory.
+
+        The tarball is streamed from codeload.github.com and read member by member,
+        so no git objects are negotiated and nothing is written to disk. Ignored
+        paths and extensions are skipped without reading their contents. Files
+        with a known language have their lines counted as they stream past, and
+        only Python sources are kept in memory for the code quality passes.
+
+        Args:
+            repo_url: GitHub repository URL
+            on_file: Optional callback invoked with (path, content) for each Python
+                file, while the download is still in progress
 
-        except GitCommandError as e:
-            print(f"[Repository Analyzer] ✗ GitPython clone failed: {e}")
+        Returns:
+            Dict with 'commit_sha' and 'files', a list of (path, size, lines, content)
+            tuples, or None if failed. lines is None for files without a known
+            language and for binary files; content is None except for Python files.
+        """
+        parsed = self._parse_repo_url(repo_url)
+        if not parsed:
+            logger.error("[Repository Analyzer] ✗ Not a GitHub repository URL: %s", repo_url)
             return None
-        except Exception as e:
-            print(f"[Repository Analyzer] ✗ Error cloning repository: {e}")
+
+        owner, repo_name = parsed
+        tarball_url = CODELOAD_TARBALL_URL.format(owner=owner, repo=repo_name)
+
+        try:
+            logger.info("[Repository Analyzer] Downloading repository snapshot...")
+            files = []
+            # Bind hot lookups locally, this loop runs once per archive entry
+            should_ignore = self._should_ignore_path
+            ignore_extensions = self.IGNORE_EXTENSIONS
+            language_map = self.LANGUAGE_MAP
+
+            with _http_session.get(tarball_url, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+
+                with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+                    for member in archive:
+                        if not member.isfile():
+                            continue
+
+                        # Entries are prefixed with a "<repo>-<sha>/" directory
+                        path = member.name.split('/', 1)[-1]
+                        # Same as _get_file_extension, inlined since it runs per entry
+                        filename = path[path.rfind('/') + 1:]
+                        dot = filename.rfind('.')
+                        ext = filename[dot:].lower() if dot != -1 else ''
+
+                        # Skip ignored paths and extensions
+                        if ext in ignore_extensions or should_ignore(path):
+                            continue
+
+                        lines = content = None
+                        if ext == '.py':
+                            content = archive.extractfile(member).read()
+                            lines = _count_lines(io.BytesIO(content))
+                            if on_file:
+                                on_file(path, content)
+                        elif ext in language_map:
+                            lines = _count_lines(archive.extractfile(member))
+
+                        files.append((path, member.size, lines, content))
+
+                    # GitHub records the commit SHA in the global pax header
+                    commit_sha = archive.pax_headers.get('comment')
+
+            logger.info("[Repository Analyzer] ✓ Downloaded %d files from %s/%s",
+                        len(files), owner, repo_name)
+            return {"commit_sha": commit_sha, "files": files}
+
+        except requests.RequestException as e:
+            logger.error("[Repository Analyzer] ✗ Download failed: %s", e)
+            return None
+        except tarfile.TarError as e:
+            logger.error("[Repository Analyzer] ✗ Could not read repository archive: %s", e)
+            return None
+        except (Urllib3HTTPError, OSError, EOFError) as e:
+            # Reading response.raw directly bypasses requests' exception wrapping
+            logger.error("[Repository Analyzer] ✗ Download interrupted: %s", e)
             return None
 
-    def analyze_repository_content_from_git(self, repo: Repo) -> Dict[str, Any]:
-        """Analyze repository content directly from git objects.
+    def analyze_repository_content(self, files: List[Tuple[str, int, Optional[int], Optional[bytes]]]) -> Dict[str, Any]:
+        """Analyze repository content from the in-memory snapshot.
 
         Args:
-            repo: GitPython Repo object
+            files: Snapshot entries from fetch_repository_snapshot
 
         Returns:
             Dict with content analysis results
         """
-        print(f"[Repository Analyzer] Analyzing repository content...")
+        logger.info("[Repository Analyzer] Analyzing repository content...")
 
         # Initialize counters
-        language_stats = defaultdict(lambda: {"files": 0, "lines": 0})
-        file_types = defaultdict(int)
+        language_stats = {}
+        file_types = {}
         total_files = 0
         total_lines = 0
-        largest_files = []
+        # Min-heap of (lines, size, path, language) holding the 10 largest files
+        largest_heap = []
+
+        # Bind hot lookups locally, this loop runs once per snapshot entry
+        get_extension = self._get_file_extension
+        language_map = self.LANGUAGE_MAP
 
         try:
-            # Get the HEAD commit tree
-            tree = repo.head.commit.tree
+            for path, size, lines, content in files:
+                ext = get_extension(path[path.rfind('/') + 1:])
 
-            # Recursively walk the tree
-            for item in tree.traverse():
-                # Skip directories (we only care about blobs/files)
-                if item.type != 'blob':
-                    continue
+                # Count total files
+                total_files += 1
+                file_type = ext if ext else 'no_extension'
+                file_types[file_type] = file_types.get(file_type, 0) + 1
+
+                language = language_map.get(ext)
+                if language is not None:
+                    bucket = language_stats.get(language)
+                    if bucket is None:
+                        bucket = language_stats[language] = {"files": 0, "lines": 0}
+                    bucket["files"] += 1
+
+                    # Binary files with a source extension have no line count
+                    if lines is None:
+                        continue
 
-                path = item.path
-                filename = path.split('/')[-1]
-                ext = self._get_file_extension(filename)
+                    bucket["lines"] += lines
+                    total_lines += lines
 
-                # Skip ignored paths and extensions
-                if self._should_ignore_path(path) or ext in self.IGNORE_EXTENSIONS:
-                    continue
+                    # Track largest files
+                    entry = (lines, size, path, language)
+                    if len(largest_heap) < 10:
+                        heapq.heappush(largest_heap, entry)
+                    elif entry > largest_heap[0]:
+                        heapq.heapreplace(largest_heap, entry)
 
-                # Count total files
-                total_files += 1
-                file_types[ext if ext else 'no_extension'] += 1
-
-                # Try to read file content for text files
-                if ext in self.LANGUAGE_MAP:
-                    language = self.LANGUAGE_MAP[ext]
-                    try:
-                        # Read content from git blob
-                        content = item.data_stream.read()
-
-                        # Try to decode as text
-                        try:
-                            text_content = content.decode('utf-8')
-                        except UnicodeDecodeError:
-                            try:
-                                text_content = content.decode('latin-1')
-                            except:
-                                # Skip binary files
-                                language_stats[language]["files"] += 1
-                                continue
-
-                        # Count lines
-                        lines = text_content.count(
-                            '\n') + (1 if text_content and not text_content.endswith('\n') else 0)
-                        language_stats[language]["files"] += 1
-                        language_stats[language]["lines"] += lines
-                        total_lines += lines
-
-                        # Track largest files
-                        largest_files.append({
-                            "path": path,
-                            "lines": lines,
-                            "size": item.size,
-                            "language": language,
-                        })
-
-                    except Exception as e:
-                        # If we can't read it, just count the file
-                        language_stats[language]["files"] += 1
-
-            # Sort largest files by lines
-            largest_files.sort(key=lambda x: x["lines"], reverse=True)
-            largest_files = largest_files[:10]
-
-            # Convert language_stats to regular dict for JSON serialization
-            language_stats = dict(language_stats)
-
-            print(
-                f"[Repository Analyzer] ✓ Analyzed {total_files} files with {total_lines} total lines")
+            # Largest files by lines, biggest first
+            largest_files = [
+                {"path": path, "lines": lines, "size": size, "language": language}
+                for lines, size, path, language in sorted(largest_heap, reverse=True)
+            ]
+
+            logger.info("[Repository Analyzer] ✓ Analyzed %d files with %d total lines",
+                        total_files, total_lines)
 
             return {
                 "total_files": total_files,
                 "total_lines": total_lines,
                 "language_breakdown": language_stats,
-                "file_types": dict(file_types),
+                "file_types": file_types,
                 "largest_files": largest_files,
             }
 
         except Exception as e:
-            print(f"[Repository Analyzer] ✗ Error analyzing content: {e}")
+            logger.error("[Repository Analyzer] ✗ Error analyzing content: %s", e)
             return {
                 "total_files": 0,
                 "total_lines": 0,
@@ -276,195 +641,271 @@ class RepositoryAnalyzer:
                 "error": str(e)
             }
 
-    def analyze_python_complexity_from_source(self, repo: Repo) -> Dict[str, Any]:
-        """Analyze Python code complexity directly from source code in memory.
+    def fetch_and_analyze_python_files(self, repo_url: str, max_workers: Optional[int] = None) -> Tuple[Optional[Dict[str, Any]], Optional[List[Any]]]:
+        """Download the repository snapshot while analyzing Python files as they arrive.
+
+        Once the archive has yielded PARALLEL_MIN_FILES uncached Python files,
+        each one is handed to a worker process as soon as it is read from the
+        tarball, so radon runs while the rest of the archive is still
+        downloading. Smaller repositories are analyzed in-process, as is
+        everything when max_workers is 1.
 
         Args:
-            repo: GitPython Repo object
+            repo_url: GitHub repository URL
+            max_workers: Maximum number of worker processes (default: CPU count)
 
         Returns:
-            Dict with complexity metrics
+            Tuple of (snapshot, per-file results for analyze_python_quality);
+            the snapshot is None if the download failed and the results are
+            None if radon is not available
         """
         if not RADON_AVAILABLE:
-            return {"error": "Radon not available"}
+            return self.fetch_repository_snapshot(repo_url), None
+
+        executor = None
+        # Per Python file in snapshot order: its blob SHA plus either a cached
+        # 'result', a pool 'future', or the 'path'/'content' still to be analyzed
+        entries = []
+        # Entries read before the pool was started, analyzed in-process if the
+        # repository turns out to be too small to be worth the process startup
+        held = []
+
+        def submit_python_file(path: str, content: bytes):
+            nonlocal executor
+            if not path.endswith('.py'):
+                return
+            key = _blob_sha(content)
+            hit, cached = _lookup_file_result(key, path)
+            if hit:
+                entries.append({"key": key, "result": cached})
+                return
+
+            entry = {"key": key, "path": path, "content": content}
+            entries.append(entry)
+            if executor is not None:
+                entry["future"] = executor.submit(_analyze_one_file, entry.pop("path"), entry.pop("content"))
+                return
+
+            held.append(entry)
+            if max_workers != 1 and len(held) >= PARALLEL_MIN_FILES:
+                executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=_MP_CONTEXT)
+                for waiting in held:
+                    waiting["future"] = executor.submit(
+                        _analyze_one_file, waiting.pop("path"), waiting.pop("content"))
+                held.clear()
 
         try:
-            tree = repo.head.commit.tree
-
-            avg_complexity = 0.0
-            high_complexity_count = 0
-            total_functions = 0
-            file_count = 0
-            complexity_data = {}
-
-            # Iterate through Python files
-            for item in tree.traverse():
-                if item.type != 'blob':
-                    continue
-
-                path = item.path
-
-                # Skip non-Python files and ignored paths
-                if not path.endswith('.py') or self._should_ignore_path(path):
+            snapshot = self.fetch_repository_snapshot(repo_url, on_file=submit_python_file)
+            if not snapshot:
+                return None, None
+
+            fresh = sum(1 for entry in entries if "result" not in entry)
+            logger.info("[Repository Analyzer] Waiting on analysis of %d Python files (%d cached)...",
+                        fresh, len(entries) - fresh)
+
+            file_results = []
+            for entry in entries:
+                if "result" in entry:
+                    file_results.append(entry["result"])
                     continue
+                if "future" in entry:
+                    result = entry["future"].result()
+                else:
+                    result = _analyze_one_file(entry["path"], entry["content"])
+                _store_file_result(entry["key"], result)
+                file_results.append(result)
+            return snapshot, file_results
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
 
-                try:
-                    # Read Python file content
-                    content = item.data_stream.read()
-                    source_code = content.decode('utf-8')
-
-                    # Use radon's complexity analysis on source code string
-                    results = cc_visit(source_code)
-
-                    if results:
-                        file_count += 1
-                        file_complexities = []
-
-                        for result in results:
-                            complexity = result.complexity
-                            avg_complexity += complexity
-                            total_functions += 1
-                            if complexity > 10:
-                                high_complexity_count += 1
-
-                            file_complexities.append({
-                                'name': result.name,
-                                'type': result.letter,
-                                'complexity': complexity,
-                                'lineno': result.lineno
-                            })
-
-                        complexity_data[path] = file_complexities
-
-                except Exception as e:
-                    # Skip files that can't be analyzed
-                    continue
-
-            if total_functions > 0:
-                avg_complexity = avg_complexity / total_functions
-
-            return {
-                "avg_complexity": round(avg_complexity, 2),
-                "high_complexity_functions": high_complexity_count,
-                "total_functions": total_functions,
-                "files_analyzed": file_count,
-                "complexity_data": complexity_data
-            }
-
-        except Exception as e:
-            return {"error": str(e)}
+    def analyze_python_quality(self, python_files: List[Tuple[str, int, Optional[bytes]]],
+                               max_workers: Optional[int] = None,
+                               file_results: Optional[List[Any]] = None) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+        """Analyze complexity, maintainability and code smells of Python files in a single pass.
 
-    def analyze_maintainability_from_source(self, repo: Repo) -> Dict[str, Any]:
-        """Analyze code maintainability directly from source code in memory.
+        Each file is decoded and parsed once; the AST feeds radon's complexity
+        and Halstead visitors and the smell checks, and the maintainability
+        index is computed from those results.
+        Files are spread across worker processes since the work is CPU-bound.
 
         Args:
-            repo: GitPython Repo object
+            python_files: Python entries from list_python_files
+            max_workers: Maximum number of worker processes (default: CPU count)
+            file_results: Per-file results already computed by
+                fetch_and_analyze_python_files, skipping the analysis step
 
         Returns:
-            Dict with maintainability metrics
+            Tuple of (complexity metrics, maintainability metrics, code smell metrics)
         """
         if not RADON_AVAILABLE:
-            return {"error": "Radon not available"}
+            error = {"error": "Radon not available"}
+            return error, error, error
 
         try:
-            tree = repo.head.commit.tree
+            total_complexity = 0.0
+            high_complexity_count = 0
+            total_functions = 0
+            file_count = 0
+            complexity_data = {}
             mi_data = {}
             mi_scores = []
-
-            # Iterate through Python files
-            for item in tree.traverse():
-                if item.type != 'blob':
+            smells_count = 0
+            issues = []
+
+            if file_results is None:
+                file_results = []
+                keys = []
+                paths = []
+                contents = []
+                for path, size, content in python_files:
+                    if content is None:
+                        continue
+                    key = _blob_sha(content)
+                    hit, cached = _lookup_file_result(key, path)
+                    if hit:
+                        file_results.append(cached)
+                    else:
+                        keys.append(key)
+                        paths.append(path)
+                        contents.append(content)
+
+                if len(paths) < PARALLEL_MIN_FILES or max_workers == 1:
+                    fresh_results = list(map(_analyze_one_file, paths, contents))
+                else:
+                    logger.info("[Repository Analyzer] Analyzing %d Python files in parallel...",
+                                len(paths))
+                    # About four chunks per worker: few IPC round trips, still some load balancing
+                    workers = max_workers or os.cpu_count() or 1
+                    chunksize = max(1, len(paths) // (4 * workers))
+                    with ProcessPoolExecutor(max_workers=max_workers, mp_context=_MP_CONTEXT) as executor:
+                        fresh_results = list(executor.map(
+                            _analyze_one_file, paths, contents, chunksize=chunksize))
+
+                for key, result in zip(keys, fresh_results):
+                    _store_file_result(key, result)
+                file_results.extend(fresh_results)
+
+            for file_result in file_results:
+                # Skip files that can't be parsed
+                if file_result is None:
                     continue
 
-                path = item.path
+                path = file_result["path"]
+                file_complexities = file_result["complexities"]
+                mi_score = file_result["mi"]
+                smells = file_result["smells"]
 
-                # Skip non-Python files and ignored paths
-                if not path.endswith('.py') or self._should_ignore_path(path):
-                    continue
-
-                try:
-                    # Read Python file content
-                    content = item.data_stream.read()
-                    source_code = content.decode('utf-8')
+                if file_complexities:
+                    file_count += 1
+                    total_complexity += file_result["complexity_total"]
+                    total_functions += len(file_complexities)
+                    high_complexity_count += file_result["high_complexity"]
+                    complexity_data[path] = file_complexities
 
-                    # Use radon's maintainability index on source code string
-                    mi_score = mi_visit(source_code, multi=True)
+                # The maintainability index is a single score for the whole module
+                mi_data[path] = {'mi': mi_score}
+                mi_scores.append(mi_score)
 
-                    if mi_score:
-                        avg_mi = sum(mi_score) / len(mi_score)
-                        mi_data[path] = {'mi': avg_mi}
-                        mi_scores.append(avg_mi)
-
-                except Exception as e:
-                    # Skip files that can't be analyzed
-                    continue
+                smells_count += len(smells)
+                if len(issues) < 100:
+                    issues.extend({"file": path, **smell} for smell in smells[:100 - len(issues)])
 
+            avg_complexity = total_complexity / total_functions if total_functions > 0 else 0.0
             avg_mi = sum(mi_scores) / len(mi_scores) if mi_scores else 0.0
 
             # Convert to grade
-            if avg_mi >= 20:
-                grade = "A"
-            elif avg_mi >= 10:
-                grade = "B"
-            elif avg_mi >= 0:
-                grade = "C"
-            else:
-                grade = "F"
+            grade = _maintainability_grade(avg_mi)
 
-            return {
+            complexity_results = {
+                "avg_complexity": round(avg_complexity, 2),
+                "high_complexity_functions": high_complexity_count,
+                "total_functions": total_functions,
+                "files_analyzed": file_count,
+                "complexity_data": complexity_data
+            }
+            mi_results = {
                 "avg_mi": round(avg_mi, 2),
                 "mi_grade": grade,
                 "mi_data": mi_data
             }
+            smells_results = {
+                "code_smells_count": smells_count,
+                "issues": issues
+            }
+            return complexity_results, mi_results, smells_results
 
         except Exception as e:
-            return {"error": str(e)}
+            error = {"error": str(e)}
+            return error, error, error
 
-    def count_python_files_from_git(self, repo: Repo) -> int:
-        """Count Python files in repository from git objects.
+    def list_python_files(self, files: List[Tuple[str, int, Optional[int], Optional[bytes]]]) -> List[Tuple[str, int, Optional[bytes]]]:
+        """Collect the Python files in the repository snapshot.
+
+        The list is built once and shared by every Python-specific analysis.
 
         Args:
-            repo: GitPython Repo object
+            files: Snapshot entries from fetch_repository_snapshot
 
         Returns:
-            Number of Python files
+            (path, size, content) tuples for Python files only
         """
-        count = 0
-        try:
-            tree = repo.head.commit.tree
-            for item in tree.traverse():
-                if item.type == 'blob' and item.path.endswith('.py') and not self._should_ignore_path(item.path):
-                    count += 1
-        except Exception as e:
-            print(f"[Repository Analyzer] Error counting Python files: {e}")
-        return count
+        return [(path, size, content) for path, size, _, content in files if path.endswith('.py')]
 
-    def analyze_code_smells(self, repo: Repo) -> Dict[str, Any]:
-        """Detect code smells and issues.
+    def _run_pylint_process(self, scratch_dir: str) -> Tuple[int, str, str]:
+        """Run pylint over a scratch directory with time and memory limits.
+
+        Pylint and its -j workers run in their own process group, so the whole
+        group can be killed on timeout. Memory and CPU limits are applied to the
+        parent right after it starts and are inherited by the workers it forks.
 
         Args:
-            repo: GitPython Repo object
+            scratch_dir: Directory holding the Python sources to lint
 
         Returns:
-            Dict with code smell metrics
+            Tuple of (return code, stdout, stderr)
+
+        Raises:
+            RuntimeError: If pylint does not finish within PYLINT_TIMEOUT
         """
-        # This is a simplified version - in production you'd use tools like pylint, flake8, etc.
-        smells_count = 0
-        issues = []
+        process = subprocess.Popen(
+            [sys.executable, "-m", "pylint", "-j", "0", "--recursive=y",
+             "--output-format=json", "--score=n", "."],
+            cwd=scratch_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True,
+        )
+
+        # prlimit instead of preexec_fn, which isn't safe with the threads Streamlit runs
+        if RESOURCE_AVAILABLE:
+            try:
+                resource.prlimit(process.pid, resource.RLIMIT_AS,
+                                 (PYLINT_MEMORY_LIMIT, PYLINT_MEMORY_LIMIT))
+                resource.prlimit(process.pid, resource.RLIMIT_CPU,
+                                 (PYLINT_TIMEOUT, PYLINT_TIMEOUT))
+            except (OSError, ValueError) as e:
+                logger.debug("[Repository Analyzer] Could not limit pylint resources: %s", e)
+
+        try:
+            stdout, stderr = process.communicate(timeout=PYLINT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.communicate()
+            raise RuntimeError(f"pylint timed out after {PYLINT_TIMEOUT}s")
 
-        # For now, we'll consider high complexity functions as code smells
-        # In a full implementation, you'd integrate with linting tools
+        return process.returncode, stdout, stderr
 
-        return {
-            "code_smells_count": smells_count,
-            "issues": issues
-        }
+    def run_pylint_analysis(self, python_files: List[Tuple[str, int, Optional[bytes]]]) -> Dict[str, Any]:
+        """Run pylint once over all Python files from the snapshot.
 
-    def run_pylint_analysis(self, repo: Repo) -> Dict[str, Any]:
-        """Run pylint analysis on Python files from git objects in memory.
+        The sources are written to a scratch directory that is removed afterwards,
+        and a single ``pylint -j 0`` process lints them all, so interpreter startup
+        and imports are paid once and pylint spreads the files across all cores.
 
         Args:
-            repo: GitPython Repo object
+            python_files: Python entries from list_python_files
 
         Returns:
             Dict with pylint metrics
@@ -481,8 +922,6 @@ class RepositoryAnalyzer:
             }
 
         try:
-            tree = repo.head.commit.tree
-
             error_count = 0
             warning_count = 0
             convention_count = 0
@@ -490,70 +929,52 @@ class RepositoryAnalyzer:
             files_analyzed = 0
             all_messages = []
 
-            # Iterate through Python files
-            for item in tree.traverse():
-                if item.type != 'blob':
-                    continue
-
-                path = item.path
-
-                # Skip non-Python files and ignored paths
-                if not path.endswith('.py') or self._should_ignore_path(path):
-                    continue
+            scratch_dir = tempfile.mkdtemp(prefix="pylint-", dir=SCRATCH_PARENT_DIR)
+            try:
+                for path, size, content in python_files:
+                    if content is None:
+                        continue
 
-                try:
-                    # Read Python file content
-                    content = item.data_stream.read()
-                    source_code = content.decode('utf-8')
-
-                    # Use epylint to analyze source code string
-                    # Create a temporary in-memory file-like object
-                    pylint_output = io.StringIO()
-                    pylint_stderr = io.StringIO()
-
-                    # Run pylint on the source string
-                    # epylint.py_run returns (stdout, stderr)
-                    try:
-                        (pylint_stdout, pylint_stderr_content) = epylint.py_run(
-                            f'--from-stdin {path}',
-                            return_std=True,
-                            script=source_code
-                        )
-
-                        # Parse output
-                        output_lines = pylint_stdout.getvalue().split('\n')
-
-                        for line in output_lines:
-                            if not line.strip():
-                                continue
-
-                            # Parse pylint message format
-                            # Format: path:line:column: message-type: message
-                            if ':' in line:
-                                parts = line.split(':')
-                                if len(parts) >= 4:
-                                    msg_type = parts[3].strip().lower()
-
-                                    if 'error' in msg_type or msg_type.startswith('e'):
-                                        error_count += 1
-                                    elif 'warning' in msg_type or msg_type.startswith('w'):
-                                        warning_count += 1
-                                    elif 'convention' in msg_type or msg_type.startswith('c'):
-                                        convention_count += 1
-                                    elif 'refactor' in msg_type or msg_type.startswith('r'):
-                                        refactor_count += 1
-
-                                    all_messages.append(line.strip())
-
-                        files_analyzed += 1
-
-                    except Exception as e:
-                        # Skip files that can't be analyzed
+                    # Never write outside the scratch directory
+                    rel_path = os.path.normpath(path)
+                    if os.path.isabs(rel_path) or rel_path.startswith('..'):
                         continue
 
-                except Exception as e:
-                    # Skip files that can't be read
-                    continue
+                    target = os.path.join(scratch_dir, rel_path)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    with open(target, 'wb') as f:
+                        f.write(content)
+                    files_analyzed += 1
+
+                if files_analyzed > 0:
+                    returncode, stdout, stderr = self._run_pylint_process(scratch_dir)
+
+                    # Non-zero exit codes are bit flags for the message types found;
+                    # 32 means pylint itself could not run
+                    if returncode & 32:
+                        raise RuntimeError(stderr.strip() or "pylint usage error")
+
+                    for message in json.loads(stdout or "[]"):
+                        msg_type = message.get("type")
+
+                        if msg_type in ("error", "fatal"):
+                            error_count += 1
+                        elif msg_type == "warning":
+                            warning_count += 1
+                        elif msg_type == "convention":
+                            convention_count += 1
+                        elif msg_type == "refactor":
+                            refactor_count += 1
+                        else:
+                            continue
+
+                        if len(all_messages) < 20:
+                            all_messages.append(
+                                f"{message.get('path')}:{message.get('line')}:{message.get('column')}: "
+                                f"{message.get('message-id')}: {message.get('message')}")
+            finally:
+                # Deleting the sources isn't needed for the result, so do it off the request path
+                _cleanup_executor.submit(shutil.rmtree, scratch_dir, ignore_errors=True)
 
             # Calculate total issues
             total_issues = error_count + warning_count + convention_count + refactor_count
@@ -578,11 +999,11 @@ class RepositoryAnalyzer:
                 "refactor_count": refactor_count,
                 "total_issues": total_issues,
                 "files_analyzed": files_analyzed,
-                "details": all_messages[:20]  # Limit to first 20 messages
+                "details": all_messages  # Limited to the first 20 messages
             }
 
         except Exception as e:
-            print(f"[Repository Analyzer] Pylint analysis error: {e}")
+            logger.error("[Repository Analyzer] Pylint analysis error: %s", e)
             return {
                 "pylint_score": 0.0,
                 "error_count": 0,
@@ -593,31 +1014,21 @@ class RepositoryAnalyzer:
                 "message": f"Analysis error: {str(e)}"
             }
 
-    def detect_test_files(self, repo: Repo) -> Dict[str, Any]:
-        """Detect test files in repository from git objects in memory.
+    def detect_test_files(self, python_files: List[Tuple[str, int, Optional[bytes]]]) -> Dict[str, Any]:
+        """Detect test files in the repository snapshot.
 
         Args:
-            repo: GitPython Repo object
+            python_files: Python entries from list_python_files
 
         Returns:
             Dict with test detection results
         """
         try:
-            tree = repo.head.commit.tree
             test_files = []
             test_directories = set()
 
-            # Iterate through all files
-            for item in tree.traverse():
-                if item.type != 'blob':
-                    continue
-
-                path = item.path
-
-                # Skip non-Python files and ignored paths
-                if not path.endswith('.py') or self._should_ignore_path(path):
-                    continue
-
+            # Iterate through Python files
+            for path, size, content in python_files:
                 filename = path.split('/')[-1]
                 directory = '/'.join(path.split('/')
                                      [:-1]) if '/' in path else ''
@@ -647,7 +1058,7 @@ class RepositoryAnalyzer:
             }
 
         except Exception as e:
-            print(f"[Repository Analyzer] Test detection error: {e}")
+            logger.error("[Repository Analyzer] Test detection error: %s", e)
             return {
                 "has_tests": False,
                 "test_files_count": 0,
@@ -680,51 +1091,47 @@ class RepositoryAnalyzer:
                 'high_complexity_functions', 0)
             avg_mi = mi_data.get('avg_mi', 0)
 
+            # Similar metrics produce the same prompt, so reuse a recent answer
+            cache_key = blake2b(
+                f"{python_files_count}|{round(avg_complexity, 1)}|{high_complexity}|{round(avg_mi, 1)}".encode()
+            ).hexdigest()
+            with _insights_cache_lock:
+                cached = _insights_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < INSIGHTS_CACHE_TTL:
+                logger.debug("[Repository Analyzer] ✓ Using cached LLM insights")
+                return dict(cached[1])
+
             prompt = f"""Analyze the following code quality metrics for a Python repository:
 
 - Number of Python files: {python_files_count}
 - Average cyclomatic complexity: {avg_complexity:.2f}
 - High complexity functions (>10): {high_complexity}
-- Average maintainability index: {avg_mi:.2f}
-
-Provide:
-1. A brief summary of overall code quality (2-3 sentences)
-2. Top 3 specific improvement suggestions
-3. A best practices score from 0-10
-
-Format your response as JSON:
-{{
-  "summary": "...",
-  "suggestions": ["...", "...", "..."],
-  "score": 7.5
-}}"""
+- Average maintainability index: {avg_mi:.2f}"""
 
             response = self.llm.client.chat.completions.create(
-                model="gpt-5-nano",
+                model=self.llm.model,
                 messages=[
-                    {"role": "system", "content": "You are a code quality expert analyzing repository metrics."},
+                    {"role": "system", "content": INSIGHTS_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
+                response_format={"type": "json_object"},
             )
 
-            content = response.choices[0].message.content.strip()
+            result = json.loads(response.choices[0].message.content)
 
-            # Extract JSON from response
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-
-            result = json.loads(content)
-
-            return {
+            insights = {
                 "quality_summary": result.get("summary", ""),
                 "improvement_suggestions": json.dumps(result.get("suggestions", [])),
                 "best_practices_score": float(result.get("score", 5.0))
             }
 
+            with _insights_cache_lock:
+                _insights_cache[cache_key] = (time.monotonic(), insights)
+
+            return dict(insights)
+
         except Exception as e:
-            print(f"[Repository Analyzer] Error getting LLM insights: {e}")
+            logger.error("[Repository Analyzer] Error getting LLM insights: %s", e)
             return {
                 "quality_summary": f"Unable to generate insights: {str(e)}",
                 "improvement_suggestions": json.dumps([]),
@@ -746,36 +1153,33 @@ Format your response as JSON:
         if total_lines == 0:
             return {}
 
-        percentages = {}
-        for language, stats in language_breakdown.items():
-            percentages[language] = (stats["lines"] / total_lines) * 100
-
-        return percentages
+        scale = 100.0 / total_lines
+        return {language: stats["lines"] * scale
+                for language, stats in language_breakdown.items()}
 
     def _get_complexity_grade(self, complexity: float) -> str:
         """Convert complexity score to letter grade."""
-        if complexity <= 5:
-            return "A"
-        elif complexity <= 10:
-            return "B"
-        elif complexity <= 20:
-            return "C"
-        elif complexity <= 30:
-            return "D"
-        elif complexity <= 40:
-            return "E"
-        else:
-            return "F"
+        return _complexity_grade(complexity)
 
-    def analyze_repository(self, repo_url: str, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    def analyze_repository(self, repo_url: str, progress_callback: Optional[Callable] = None,
+                           include_file_details: bool = False,
+                           max_workers: Optional[int] = None,
+                           head_sha: Optional[str] = None) -> Dict[str, Any]:
         """Perform comprehensive analysis of a GitHub repository in memory.
 
         This method combines content analysis and code quality analysis into a single
-        operation, working primarily in memory with git objects.
+        operation, working entirely in memory on a downloaded snapshot of HEAD.
+        If this process already analyzed the current HEAD commit, that result is
+        returned without downloading anything.
 
         Args:
             repo_url: GitHub repository URL
             progress_callback: Optional callback for progress updates
+            include_file_details: Include per-file complexity and MI in
+                'file_quality_details' (can be large for big repositories)
+            max_workers: Maximum number of worker processes for Python analysis
+            head_sha: HEAD commit SHA if the caller already resolved it with
+                get_head_sha, saving a request
 
         Returns:
             Dict with comprehensive repository metrics including:
@@ -783,166 +1187,217 @@ Format your response as JSON:
             - Code quality metrics (complexity, maintainability)
             - LLM-generated insights
         """
-        repo = None
         try:
+            # Reuse the previous result if HEAD has not moved
+            parsed = self._parse_repo_url(repo_url)
+            if head_sha is None:
+                head_sha = self.get_head_sha(repo_url)
+            repo_key = "/".join(parsed).lower() if parsed else None
+            if repo_key and head_sha:
+                cache_key = (repo_key, head_sha, include_file_details)
+                with _content_cache_lock:
+                    cached = _content_cache.get(cache_key)
+                    if cached is not None:
+                        _content_cache.move_to_end(cache_key)
+                if cached is not None:
+                    logger.debug("[Repository Analyzer] ✓ Using cached analysis for %s", head_sha[:7])
+                    return dict(cached)
+
             if progress_callback:
-                progress_callback("Cloning repository...")
+                progress_callback("Downloading repository...")
+
+            # Download repository snapshot into memory, analyzing Python files as they arrive
+            snapshot, python_file_results = self.fetch_and_analyze_python_files(
+                repo_url, max_workers=max_workers)
+            if not snapshot:
+                return {"error": "Failed to download repository"}
+            files = snapshot["files"]
+
+            # Collect Python files once for all Python-specific passes
+            python_files = self.list_python_files(files)
+            python_files_count = len(python_files)
+
+            # Pylint is a subprocess and the slowest step, so start it now and let it
+            # run while everything else is computed on this thread
+            pylint_executor = ThreadPoolExecutor(max_workers=1)
+            pylint_future = None
+            if python_files_count > 0:
+                pylint_future = pylint_executor.submit(self.run_pylint_analysis, python_files)
+
+            try:
+                results = self._collect_analysis_results(
+                    files, python_files, python_file_results, pylint_future,
+                    progress_callback, include_file_details, max_workers)
+                results["commit_sha"] = snapshot["commit_sha"]
+                results["analyzer_version"] = ANALYZER_VERSION
+
+                # Key on the SHA the tarball was actually built from, in case HEAD moved
+                snapshot_sha = snapshot["commit_sha"] or head_sha
+                if repo_key and snapshot_sha and "error" not in results:
+                    with _content_cache_lock:
+                        _content_cache[(repo_key, snapshot_sha, include_file_details)] = results
+                        while len(_content_cache) > CONTENT_CACHE_SIZE:
+                            _content_cache.popitem(last=False)
+                return dict(results)
+            finally:
+                pylint_executor.shutdown(wait=False, cancel_futures=True)
 
-            # Clone repository into memory
-            repo = self.clone_repository_in_memory(repo_url)
-            if not repo:
-                return {"error": "Failed to clone repository"}
+        except Exception as e:
+            logger.error("[Repository Analyzer] Error analyzing repository: %s", e)
+            return {"error": str(e)}
 
-            # Initialize results dict
-            results = {}
+    def _collect_analysis_results(self, files: List[Tuple[str, int, Optional[int], Optional[bytes]]],
+                                  python_files: List[Tuple[str, int, Optional[bytes]]],
+                                  python_file_results: Optional[List[Any]],
+                                  pylint_future: Optional[Future],
+                                  progress_callback: Optional[Callable],
+                                  include_file_details: bool,
+                                  max_workers: Optional[int]) -> Dict[str, Any]:
+        """Run the remaining analyses on the snapshot while pylint runs in the background.
 
-            # === Content Analysis ===
-            if progress_callback:
-                progress_callback("Analyzing repository content...")
+        Args:
+            files: Snapshot entries from fetch_repository_snapshot
+            python_files: Python entries from list_python_files
+            python_file_results: Per-file results from fetch_and_analyze_python_files
+            pylint_future: Pending run_pylint_analysis result, or None without Python files
+            progress_callback: Optional callback for progress updates
+            include_file_details: Include per-file complexity and MI in 'file_quality_details'
+            max_workers: Maximum number of worker processes for Python analysis
 
-            content_results = self.analyze_repository_content_from_git(repo)
-            results.update(content_results)
+        Returns:
+            Dict with comprehensive repository metrics
+        """
+        python_files_count = len(python_files)
 
-            # === Code Quality Analysis (Python-specific) ===
-            if progress_callback:
-                progress_callback("Analyzing code complexity...")
+        # Initialize results dict
+        results = {}
 
-            # Count Python files
-            python_files_count = self.count_python_files_from_git(repo)
-            results["python_files_count"] = python_files_count
+        # === Content Analysis ===
+        if progress_callback:
+            progress_callback("Analyzing repository content...")
 
-            if python_files_count > 0:
-                # Analyze complexity
-                complexity_results = self.analyze_python_complexity_from_source(
-                    repo)
-                if "error" in complexity_results:
-                    print(
-                        f"[Repository Analyzer] Complexity analysis error: {complexity_results['error']}")
-                    complexity_results = {
-                        "avg_complexity": 0.0,
-                        "high_complexity_functions": 0,
-                        "total_functions": 0,
-                        "files_analyzed": 0,
-                        "complexity_data": {}
-                    }
-
-                if progress_callback:
-                    progress_callback("Analyzing maintainability...")
-
-                # Analyze maintainability
-                mi_results = self.analyze_maintainability_from_source(repo)
-                if "error" in mi_results:
-                    print(
-                        f"[Repository Analyzer] MI analysis error: {mi_results['error']}")
-                    mi_results = {"avg_mi": 0.0,
-                                  "mi_grade": "C", "mi_data": {}}
-
-                if progress_callback:
-                    progress_callback("Detecting code smells...")
-
-                # Analyze code smells
-                smells_results = self.analyze_code_smells(repo)
-
-                # Run Pylint analysis
-                if progress_callback:
-                    progress_callback("Running Pylint analysis...")
-                pylint_results = self.run_pylint_analysis(repo)
-                if "error" in pylint_results and "Pylint not available" not in pylint_results.get("error", ""):
-                    print(
-                        f"[Repository Analyzer] Pylint analysis error: {pylint_results['error']}")
-
-                # Detect test files
-                if progress_callback:
-                    progress_callback("Detecting test files...")
-                test_detection_results = self.detect_test_files(repo)
-
-                if progress_callback:
-                    progress_callback("Generating insights...")
-
-                # Get LLM insights
-                llm_insights = self.get_llm_insights(
-                    complexity_results,
-                    mi_results,
-                    python_files_count
-                )
+        content_results = self.analyze_repository_content(files)
+        results.update(content_results)
 
-                # Determine complexity grade
-                avg_complexity = complexity_results.get('avg_complexity', 0)
-                complexity_grade = self._get_complexity_grade(avg_complexity)
-
-                # Add quality metrics to results
-                results.update({
-                    "avg_complexity": avg_complexity,
-                    "complexity_grade": complexity_grade,
-                    "maintainability_index": mi_results.get('avg_mi', 0),
-                    "maintainability_grade": mi_results.get('mi_grade', 'C'),
-                    "code_smells_count": smells_results.get('code_smells_count', 0),
-                    "high_complexity_functions": complexity_results.get('high_complexity_functions', 0),
-                    "files_analyzed": complexity_results.get('files_analyzed', 0),
-                    "quality_summary": llm_insights.get('quality_summary', ''),
-                    "improvement_suggestions": llm_insights.get('improvement_suggestions', '[]'),
-                    "best_practices_score": llm_insights.get('best_practices_score', 5.0),
-                    "file_quality_details": json.dumps({
-                        "complexity": complexity_results.get('complexity_data', {}),
-                        "maintainability": mi_results.get('mi_data', {})
-                    }),
-                    # Pylint results
-                    "pylint_score": pylint_results.get('pylint_score', 0.0),
-                    "pylint_errors": pylint_results.get('error_count', 0),
-                    "pylint_warnings": pylint_results.get('warning_count', 0),
-                    "pylint_conventions": pylint_results.get('convention_count', 0),
-                    "pylint_refactors": pylint_results.get('refactor_count', 0),
-                    "pylint_total_issues": pylint_results.get('total_issues', 0),
-                    # Test detection results
-                    "has_tests": test_detection_results.get('has_tests', False),
-                    "test_files_count": test_detection_results.get('test_files_count', 0),
-                })
-            else:
-                # No Python files - add default quality metrics
-                results.update({
+        # === Code Quality Analysis (Python-specific) ===
+        if progress_callback:
+            progress_callback("Analyzing code complexity...")
+
+        results["python_files_count"] = python_files_count
+
+        if python_files_count > 0:
+            # Analyze complexity, maintainability and code smells in one pass
+            complexity_results, mi_results, smells_results = self.analyze_python_quality(
+                python_files, max_workers=max_workers, file_results=python_file_results)
+            if "error" in complexity_results:
+                logger.error("[Repository Analyzer] Complexity analysis error: %s",
+                             complexity_results['error'])
+                complexity_results = {
                     "avg_complexity": 0.0,
-                    "complexity_grade": "N/A",
-                    "maintainability_index": 0.0,
-                    "maintainability_grade": "N/A",
-                    "code_smells_count": 0,
                     "high_complexity_functions": 0,
+                    "total_functions": 0,
                     "files_analyzed": 0,
-                    "quality_summary": "No Python files found for quality analysis",
-                    "improvement_suggestions": "[]",
-                    "best_practices_score": 0.0,
-                    "file_quality_details": "{}",
-                    # Pylint defaults
-                    "pylint_score": 0.0,
-                    "pylint_errors": 0,
-                    "pylint_warnings": 0,
-                    "pylint_conventions": 0,
-                    "pylint_refactors": 0,
-                    "pylint_total_issues": 0,
-                    # Test detection defaults
-                    "has_tests": False,
-                    "test_files_count": 0,
-                })
+                    "complexity_data": {}
+                }
 
-            results["status"] = "completed"
-            return results
+            if "error" in mi_results:
+                logger.error("[Repository Analyzer] MI analysis error: %s", mi_results['error'])
+                mi_results = {"avg_mi": 0.0,
+                              "mi_grade": "C", "mi_data": {}}
 
-        except Exception as e:
-            print(f"[Repository Analyzer] Error analyzing repository: {e}")
-            return {"error": str(e)}
+            if "error" in smells_results:
+                smells_results = {"code_smells_count": 0, "issues": []}
 
-        finally:
-            # Clean up repository if it exists
-            if repo:
-                try:
-                    import shutil
-                    import os
-                    repo_dir = repo.working_dir
-                    repo.close()
-                    if os.path.exists(repo_dir):
-                        shutil.rmtree(repo_dir)
-                except Exception as e:
-                    print(
-                        f"[Repository Analyzer] Error cleaning up repository: {e}")
+            # Detect test files
+            if progress_callback:
+                progress_callback("Detecting test files...")
+            test_detection_results = self.detect_test_files(python_files)
+
+            if progress_callback:
+                progress_callback("Generating insights...")
+
+            # Get LLM insights
+            llm_insights = self.get_llm_insights(
+                complexity_results,
+                mi_results,
+                python_files_count
+            )
+
+            # Collect the Pylint analysis started before content analysis
+            if progress_callback:
+                progress_callback("Running Pylint analysis...")
+            pylint_results = pylint_future.result()
+            if "error" in pylint_results and "Pylint not available" not in pylint_results.get("error", ""):
+                logger.error("[Repository Analyzer] Pylint analysis error: %s", pylint_results['error'])
+
+            # Per-file details are only serialized when requested
+            file_quality_details = "{}"
+            if include_file_details:
+                file_quality_details = json.dumps({
+                    "complexity": {
+                        path: [{"name": entry['name'], "complexity": entry['complexity']}
+                               for entry in entries]
+                        for path, entries in complexity_results.get('complexity_data', {}).items()
+                    },
+                    "maintainability": mi_results.get('mi_data', {})
+                })
+
+            # Determine complexity grade
+            avg_complexity = complexity_results.get('avg_complexity', 0)
+            complexity_grade = self._get_complexity_grade(avg_complexity)
+
+            # Add quality metrics to results
+            results.update({
+                "avg_complexity": avg_complexity,
+                "complexity_grade": complexity_grade,
+                "maintainability_index": mi_results.get('avg_mi', 0),
+                "maintainability_grade": mi_results.get('mi_grade', 'C'),
+                "code_smells_count": smells_results.get('code_smells_count', 0),
+                "high_complexity_functions": complexity_results.get('high_complexity_functions', 0),
+                "files_analyzed": complexity_results.get('files_analyzed', 0),
+                "quality_summary": llm_insights.get('quality_summary', ''),
+                "improvement_suggestions": llm_insights.get('improvement_suggestions', '[]'),
+                "best_practices_score": llm_insights.get('best_practices_score', 5.0),
+                "file_quality_details": file_quality_details,
+                # Pylint results
+                "pylint_score": pylint_results.get('pylint_score', 0.0),
+                "pylint_errors": pylint_results.get('error_count', 0),
+                "pylint_warnings": pylint_results.get('warning_count', 0),
+                "pylint_conventions": pylint_results.get('convention_count', 0),
+                "pylint_refactors": pylint_results.get('refactor_count', 0),
+                "pylint_total_issues": pylint_results.get('total_issues', 0),
+                # Test detection results
+                "has_tests": test_detection_results.get('has_tests', False),
+                "test_files_count": test_detection_results.get('test_files_count', 0),
+            })
+        else:
+            # No Python files - add default quality metrics
+            results.update({
+                "avg_complexity": 0.0,
+                "complexity_grade": "N/A",
+                "maintainability_index": 0.0,
+                "maintainability_grade": "N/A",
+                "code_smells_count": 0,
+                "high_complexity_functions": 0,
+                "files_analyzed": 0,
+                "quality_summary": "No Python files found for quality analysis",
+                "improvement_suggestions": "[]",
+                "best_practices_score": 0.0,
+                "file_quality_details": "{}",
+                # Pylint defaults
+                "pylint_score": 0.0,
+                "pylint_errors": 0,
+                "pylint_warnings": 0,
+                "pylint_conventions": 0,
+                "pylint_refactors": 0,
+                "pylint_total_issues": 0,
+                # Test detection defaults
+                "has_tests": False,
+                "test_files_count": 0,
+            })
+
+        results["status"] = "completed"
+        return results
 
     def analyze_from_url(self, repo_url: str) -> Dict[str, Any]:
         """Legacy method for content-only analysis.
@@ -953,27 +1408,10 @@ Format your response as JSON:
         Returns:
             Dict with content analysis results
         """
-        repo = None
-        try:
-            # Clone repository
-            repo = self.clone_repository_in_memory(repo_url)
-            if not repo:
-                return {"error": "Failed to clone repository"}
-
-            # Analyze content
-            results = self.analyze_repository_content_from_git(repo)
-            return results
+        # Download repository snapshot
+        snapshot = self.fetch_repository_snapshot(repo_url)
+        if not snapshot:
+            return {"error": "Failed to download repository"}
 
-        finally:
-            # Clean up repository if it exists
-            if repo:
-                try:
-                    import shutil
-                    import os
-                    repo_dir = repo.working_dir
-                    repo.close()
-                    if os.path.exists(repo_dir):
-                        shutil.rmtree(repo_dir)
-                except Exception as e:
-                    print(
-                        f"[Repository Analyzer] Error cleaning up repository: {e}")
+        # Analyze content
+        return self.analyze_repository_content(snapshot["files"])
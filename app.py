@@ -2,11 +2,8 @@
 
 import streamlit as st
 import config
-from database import DatabaseManager
+from utils.resources import get_db_manager
 from routes import is_on_home_page, is_on_analyze_page, get_repo_from_url, navigate_to_home
-from page.home import display_home_page
-from page.analyze import display_analyze_page
-from page.dashboard import display_repository_dashboard
 
 # Page configuration
 st.set_page_config(
@@ -28,11 +25,15 @@ if "openai_key" not in st.session_state:
 
 def main():
     """Main application entry point with URL routing."""
-    db_manager = DatabaseManager()
+    db_manager = get_db_manager()
 
+    # Page modules are imported only for the page being shown, since the analyze
+    # and dashboard pages pull in the analyzers, pandas and plotly
     if is_on_analyze_page():
+        from page.analyze import display_analyze_page
         display_analyze_page(db_manager)
     elif is_on_home_page():
+        from page.home import display_home_page
         display_home_page(db_manager)
     else:
         repo_record, error_message = get_repo_from_url(db_manager)
@@ -42,11 +43,12 @@ def main():
             st.info("🔄 Redirecting to home page...")
             st.button("Go to Home", on_click=navigate_to_home, type="primary")
 
-            import time
-            time.sleep(2)
-            navigate_to_home()
-            st.rerun()
+            # Redirect from the browser after 2s instead of sleeping on the script thread.
+            # A meta refresh in the page itself, since component iframes are sandboxed
+            # and cannot navigate the parent window.
+            st.markdown('<meta http-equiv="refresh" content="2; url=?">', unsafe_allow_html=True)
         elif repo_record:
+            from page.dashboard import display_repository_dashboard
             display_repository_dashboard(db_manager, repo_record)
         else:
             st.error("❌ An unexpected error occurred")
@@ -12,6 +12,7 @@ from .models import (
     IssueMetric,
     IssueComment,
     RepositoryContent,
+    LLMCache,
 )
 from .db_manager import DatabaseManager
 
@@ -27,5 +28,6 @@ __all__ = [
     "IssueMetric",
     "IssueComment",
     "RepositoryContent",
+    "LLMCache",
     "DatabaseManager",
 ]
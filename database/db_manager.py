@@ -2,8 +2,9 @@
 
 from datetime import datetime
 from sqlalchemy import create_engine, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import sessionmaker, Session, scoped_session
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 import json
 
 from .models import (
@@ -16,6 +17,7 @@ from .models import (
     PRMetric,
     Issue,
     IssueMetric,
+    LLMCache,
 )
 import config
 
@@ -62,13 +64,18 @@ class DatabaseManager:
         finally:
             session.close()
 
-    def update_repository_last_analyzed(self, repo_id: int):
-        """Update the last analyzed timestamp for a repository."""
+    def update_repository_last_analyzed(self, repo_id: int, analyzed_at: Optional[datetime] = None):
+        """Update the last analyzed timestamp for a repository.
+
+        Args:
+            repo_id: GitHub repository ID
+            analyzed_at: Naive UTC time the analysis started; defaults to now
+        """
         session = self.get_session()
         try:
             repo = session.query(Repository).filter_by(repo_id=repo_id).first()
             if repo:
-                repo.last_analyzed = datetime.utcnow()
+                repo.last_analyzed = analyzed_at or datetime.utcnow()
                 session.commit()
         finally:
             session.close()
@@ -114,7 +121,49 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def get_or_create_contributors(self, contributors_data: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Get or create many contributor records in one round-trip.
+
+        Args:
+            contributors_data: Contributor dicts, duplicates are allowed
+
+        Returns:
+            Dict mapping username to contributor id
+        """
+        unique_contributors = {}
+        for contributor_data in contributors_data:
+            if contributor_data and contributor_data["username"] not in unique_contributors:
+                unique_contributors[contributor_data["username"]] = contributor_data
+
+        if not unique_contributors:
+            return {}
+
+        session = self.get_session()
+        try:
+            # Insert missing contributors, leaving existing ones untouched. Rows go in
+            # username order so concurrent callers lock the unique index in the same
+            # order and cannot deadlock each other
+            session.execute(
+                pg_insert(Contributor).on_conflict_do_nothing(index_elements=["username"]),
+                [unique_contributors[username] for username in sorted(unique_contributors)]
+            )
+            rows = session.query(Contributor.id, Contributor.username).filter(
+                Contributor.username.in_(list(unique_contributors))
+            ).all()
+            session.commit()
+            return {username: contributor_id for contributor_id, username in rows}
+        finally:
+            session.close()
+
     # Commit operations
+    def get_commit_shas(self, repo_id: int) -> Set[str]:
+        """Get the SHAs of every stored commit of a repository."""
+        session = self.get_session()
+        try:
+            return {sha for (sha,) in session.query(Commit.sha).filter(Commit.repo_id == repo_id)}
+        finally:
+            session.close()
+
     def save_commit(self, commit_data: Dict[str, Any]) -> Commit:
         """Save a commit record."""
         session = self.get_session()
@@ -138,6 +187,21 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def save_commits_bulk(self, commits_data: List[Dict[str, Any]]):
+        """Save many commit records in one transaction, skipping existing SHAs."""
+        if not commits_data:
+            return
+
+        session = self.get_session()
+        try:
+            session.execute(
+                pg_insert(Commit).on_conflict_do_nothing(index_elements=["sha"]),
+                commits_data
+            )
+            session.commit()
+        finally:
+            session.close()
+
     def save_commit_metric(self, metric_data: Dict[str, Any]) -> CommitMetric:
         """Save commit metrics."""
         session = self.get_session()
@@ -225,6 +289,77 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def save_pull_requests_bulk(self, repo_id: int, prs_data: List[Dict[str, Any]]) -> Dict[int, int]:
+        """Save many pull request records in one transaction, updating existing ones.
+
+        Args:
+            repo_id: Repository ID the PRs belong to
+            prs_data: PR dicts as accepted by save_pull_request; if a PR number
+                repeats, the last entry wins
+
+        Returns:
+            Dict mapping PR number to pull request id
+        """
+        if not prs_data:
+            return {}
+
+        # A PR can appear twice when pages shift during listing; keep one row per number
+        prs_data = list({pr_data["pr_number"]: pr_data for pr_data in prs_data}.values())
+
+        session = self.get_session()
+        try:
+            pr_numbers = [pr_data["pr_number"] for pr_data in prs_data]
+            existing = {
+                pr.pr_number: pr
+                for pr in session.query(PullRequest).filter(
+                    PullRequest.repo_id == repo_id,
+                    PullRequest.pr_number.in_(pr_numbers)
+                )
+            }
+
+            records = []
+            for pr_data in prs_data:
+                pr = existing.get(pr_data["pr_number"])
+                if pr:
+                    # Update existing PR
+                    for key, value in pr_data.items():
+                        setattr(pr, key, value)
+                else:
+                    pr = PullRequest(**pr_data)
+                    session.add(pr)
+                records.append(pr)
+
+            # Flush to assign ids before commit expires the objects
+            session.flush()
+            pr_ids = {pr.pr_number: pr.id for pr in records}
+            session.commit()
+            return pr_ids
+        finally:
+            session.close()
+
+    def save_pr_metrics_bulk(self, metrics_data: List[Dict[str, Any]]):
+        """Save many PR metrics in one transaction, replacing existing ones."""
+        if not metrics_data:
+            return
+
+        session = self.get_session()
+        try:
+            stmt = pg_insert(PRMetric)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["pr_id"],
+                set_={
+                    "description_quality_score": stmt.excluded.description_quality_score,
+                    "description_quality_feedback": stmt.excluded.description_quality_feedback,
+                    "linked_to_issue": stmt.excluded.linked_to_issue,
+                    "avg_comment_length": stmt.excluded.avg_comment_length,
+                    "calculated_at": stmt.excluded.calculated_at,
+                }
+            )
+            session.execute(stmt, metrics_data)
+            session.commit()
+        finally:
+            session.close()
+
     # Issue operations
     def save_issue(self, issue_data: Dict[str, Any]) -> Issue:
         """Save an issue record."""
@@ -258,6 +393,54 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def save_issues_bulk(self, repo_id: int, issues_data: List[Dict[str, Any]]) -> Dict[int, int]:
+        """Save many issue records in one transaction, updating existing ones.
+
+        Args:
+            repo_id: Repository ID the issues belong to
+            issues_data: Issue dicts as accepted by save_issue; if an issue number
+                repeats, the last entry wins
+
+        Returns:
+            Dict mapping issue number to issue id
+        """
+        if not issues_data:
+            return {}
+
+        # An issue can appear twice when pages shift during listing; keep one row per number
+        issues_data = list({issue_data["issue_number"]: issue_data for issue_data in issues_data}.values())
+
+        session = self.get_session()
+        try:
+            issue_numbers = [issue_data["issue_number"] for issue_data in issues_data]
+            existing = {
+                issue.issue_number: issue
+                for issue in session.query(Issue).filter(
+                    Issue.repo_id == repo_id,
+                    Issue.issue_number.in_(issue_numbers)
+                )
+            }
+
+            records = []
+            for issue_data in issues_data:
+                issue = existing.get(issue_data["issue_number"])
+                if issue:
+                    # Update existing issue
+                    for key, value in issue_data.items():
+                        setattr(issue, key, value)
+                else:
+                    issue = Issue(**issue_data)
+                    session.add(issue)
+                records.append(issue)
+
+            # Flush to assign ids before commit expires the objects
+            session.flush()
+            issue_ids = {issue.issue_number: issue.id for issue in records}
+            session.commit()
+            return issue_ids
+        finally:
+            session.close()
+
     def save_issue_metric(self, metric_data: Dict[str, Any]) -> IssueMetric:
         """Save issue metrics."""
         session = self.get_session()
@@ -286,6 +469,68 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def save_issue_metrics_bulk(self, metrics_data: List[Dict[str, Any]]):
+        """Save many issue metrics in one transaction, replacing existing ones."""
+        if not metrics_data:
+            return
+
+        session = self.get_session()
+        try:
+            stmt = pg_insert(IssueMetric)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["issue_id"],
+                set_={
+                    "description_quality_score": stmt.excluded.description_quality_score,
+                    "description_quality_feedback": stmt.excluded.description_quality_feedback,
+                    "calculated_at": stmt.excluded.calculated_at,
+                }
+            )
+            session.execute(stmt, metrics_data)
+            session.commit()
+        finally:
+            session.close()
+
+    # LLM cache operations
+    def get_llm_cache_many(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get cached LLM analyses for many keys in one query.
+
+        Returns:
+            Dict mapping each cached key to a dict with 'score' and 'feedback'
+        """
+        if not keys:
+            return {}
+
+        session = self.get_session()
+        try:
+            entries = session.query(LLMCache.key, LLMCache.score, LLMCache.feedback).filter(
+                LLMCache.key.in_(keys)
+            ).all()
+            return {entry.key: {"score": entry.score, "feedback": entry.feedback} for entry in entries}
+        finally:
+            session.close()
+
+    def save_llm_cache_many(self, model: str, analyses: Dict[str, Dict[str, Any]]):
+        """Store many LLM analyses keyed by cache key, keeping existing entries."""
+        if not analyses:
+            return
+
+        session = self.get_session()
+        try:
+            now = datetime.utcnow()
+            session.execute(
+                pg_insert(LLMCache).on_conflict_do_nothing(index_elements=["key"]),
+                [{
+                    "key": key,
+                    "model": model,
+                    "score": analysis["score"],
+                    "feedback": analysis["feedback"],
+                    "created_at": now,
+                } for key, analysis in analyses.items()]
+            )
+            session.commit()
+        finally:
+            session.close()
+
     # Comment operations
     def save_pr_comment(self, comment_data: Dict[str, Any]):
         """Save a PR comment."""
@@ -327,6 +572,57 @@ class DatabaseManager:
         finally:
             session.close()
 
+    def save_pr_comments_bulk(self, comments_data: List[Dict[str, Any]]) -> int:
+        """Save many PR comments in one transaction, skipping ones already stored.
+
+        Args:
+            comments_data: Comment dicts as accepted by save_pr_comment
+
+        Returns:
+            Number of comments inserted
+        """
+        from .models import PRComment
+        return self._save_comments_bulk(PRComment, comments_data)
+
+    def save_issue_comments_bulk(self, comments_data: List[Dict[str, Any]]) -> int:
+        """Save many issue comments in one transaction, skipping ones already stored.
+
+        Args:
+            comments_data: Comment dicts as accepted by save_issue_comment
+
+        Returns:
+            Number of comments inserted
+        """
+        from .models import IssueComment
+        return self._save_comments_bulk(IssueComment, comments_data)
+
+    def _save_comments_bulk(self, model, comments_data: List[Dict[str, Any]]) -> int:
+        """Insert comment rows whose GitHub comment_id isn't stored yet."""
+        if not comments_data:
+            return 0
+
+        session = self.get_session()
+        try:
+            # comment_id has no unique constraint, so filter existing ids up front
+            comment_ids = {comment["comment_id"] for comment in comments_data}
+            existing = {
+                comment_id for (comment_id,) in session.query(model.comment_id).filter(
+                    model.comment_id.in_(list(comment_ids)))
+            }
+
+            new_rows = []
+            for comment in comments_data:
+                if comment["comment_id"] not in existing:
+                    existing.add(comment["comment_id"])
+                    new_rows.append(comment)
+
+            if new_rows:
+                session.execute(model.__table__.insert(), new_rows)
+            session.commit()
+            return len(new_rows)
+        finally:
+            session.close()
+
     # Analytics queries
     def get_contributor_stats(self, repo_id: int) -> List[Dict[str, Any]]:
         """Get contributor statistics for a repository."""
@@ -573,6 +869,8 @@ class DatabaseManager:
                 "improvement_suggestions": metrics.improvement_suggestions,
                 "best_practices_score": metrics.best_practices_score,
                 "file_quality_details": metrics.file_quality_details,
+                "commit_sha": metrics.commit_sha,
+                "analyzer_version": metrics.analyzer_version,
                 "analyzed_at": metrics.analyzed_at,
             }
         finally:
@@ -324,7 +324,26 @@ class CodeQualityMetric(Base):
     has_tests = Column(Boolean, default=False)
     test_files_count = Column(Integer, default=0)
 
+    # Snapshot these metrics were computed from, used to skip re-analysis of an unchanged HEAD
+    commit_sha = Column(String(40))
+    analyzer_version = Column(String(20))
+
     analyzed_at = Column(DateTime, default=datetime.utcnow)
 
     def __repr__(self):
         return f"<CodeQualityMetric repo_id={self.repo_id} grade={self.complexity_grade}>"
+
+
+class LLMCache(Base):
+    """Model for cached LLM quality analyses, keyed by a hash of the prompt inputs."""
+
+    __tablename__ = "llm_cache"
+
+    key = Column(String(64), primary_key=True)  # SHA-256 hex of (kind, model, title, body)
+    model = Column(String(100), nullable=False)
+    score = Column(Float)
+    feedback = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<LLMCache {self.key[:12]} score={self.score}>"
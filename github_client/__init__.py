@@ -1,5 +1,6 @@
 """GitHub API client package."""
 
 from .api_client import GitHubClient
+from .rate_limiter import RateLimiter
 
-__all__ = ["GitHubClient"]
+__all__ = ["GitHubClient", "RateLimiter"]
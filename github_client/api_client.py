@@ -1,9 +1,38 @@
 """GitHub API client for fetching repository data."""
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List, Set, Tuple
 from github import Github, GithubException, Auth
 from datetime import datetime
 import re
+import requests
+from requests.adapters import HTTPAdapter
+from .rate_limiter import RateLimiter
+
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Items per REST page (GitHub's maximum); the default of 30 needs 3.3x as many requests
+REST_PAGE_SIZE = 100
+
+# Pooled keep-alive connections to api.github.com, sized for the fetch thread pools
+# so concurrent workers reuse TLS connections instead of opening throwaway ones
+HTTP_POOL_SIZE = 30
+
+# PRs/issues per GraphQL query; keeps the worst-case node count of the nested
+# review-thread connections well under GitHub's per-query limit
+GRAPHQL_BATCH_SIZE = 25
+
+# Attempts per GraphQL batch when GitHub rejects it with a rate limit
+GRAPHQL_MAX_ATTEMPTS = 3
+
+GRAPHQL_COMMENT_FIELDS = "databaseId body createdAt author { login __typename }"
+
+GRAPHQL_PR_FIELDS = (
+    "comments(first: 100) { totalCount nodes { %s } } "
+    "reviewThreads(first: 50) { totalCount nodes { comments(first: 50) { totalCount nodes { %s } } } }"
+) % (GRAPHQL_COMMENT_FIELDS, GRAPHQL_COMMENT_FIELDS)
+
+GRAPHQL_ISSUE_FIELDS = "comments(first: 100) { totalCount nodes { %s } }" % GRAPHQL_COMMENT_FIELDS
 
 
 class GitHubClient:
@@ -12,13 +41,27 @@ class GitHubClient:
     def __init__(self, token: str):
         """Initialize GitHub client with authentication token."""
         auth = Auth.Token(token)
-        self.github = Github(auth=auth)
+        self.github = Github(
+            auth=auth, per_page=REST_PAGE_SIZE, pool_size=HTTP_POOL_SIZE)
+        self._graphql_session = requests.Session()
+        self._graphql_session.mount("https://", HTTPAdapter(
+            pool_connections=1, pool_maxsize=HTTP_POOL_SIZE))
+        self._graphql_session.headers["Authorization"] = f"bearer {token}"
+        # Shared by every thread using this client, since GitHub limits are per token
+        self.rate_limiter = RateLimiter()
         self.user = None
         try:
             self.user = self.github.get_user()
         except GithubException as e:
             raise ValueError(f"Invalid GitHub token: {e}")
 
+    def _throttle(self):
+        """Feed PyGithub's last-seen rate-limit state to the limiter and wait out any backoff."""
+        remaining, _ = self.github.rate_limiting
+        self.rate_limiter.note_remaining(
+            remaining, self.github.rate_limiting_resettime)
+        self.rate_limiter.acquire()
+
     def parse_repo_url(self, url: str) -> tuple[str, str]:
         """Parse GitHub repository URL to extract owner and repo name."""
         # Handle various GitHub URL formats
@@ -66,8 +109,13 @@ class GitHubClient:
                 raise ValueError(
                     f"Could not access repository '{owner}/{repo_name}': {e}")
 
-    def get_commits(self, owner: str, repo_name: str, since: Optional[datetime] = None, progress_callback=None) -> List[Dict[str, Any]]:
-        """Fetch all commits from a repository."""
+    def get_commits(self, owner: str, repo_name: str, since: Optional[datetime] = None, progress_callback=None,
+                    skip_shas: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+        """Fetch all commits from a repository.
+
+        Commits in skip_shas are listed but not returned, so their per-commit
+        detail request (stats and files) is never made.
+        """
         try:
             print(f"[GitHub API] Fetching commits from {owner}/{repo_name}...")
             repo = self.github.get_repo(f"{owner}/{repo_name}")
@@ -86,9 +134,12 @@ class GitHubClient:
             commit_data = []
             commit_count = 0
             for commit in commits:
+                self._throttle()
                 commit_count += 1
                 if progress_callback and total_count is not None:
                     progress_callback(commit_count, total_count, "commits")
+                if skip_shas and commit.sha in skip_shas:
+                    continue
                 try:
                     # Get contributor information
                     author = commit.author
@@ -136,26 +187,38 @@ class GitHubClient:
             print(f"[GitHub API] ✗ Failed to fetch commits: {e}")
             raise ValueError(f"Could not fetch commits: {e}")
 
-    def get_pull_requests(self, owner: str, repo_name: str, state: str = "all", progress_callback=None) -> List[Dict[str, Any]]:
-        """Fetch all pull requests from a repository."""
+    def get_pull_requests(self, owner: str, repo_name: str, state: str = "all", progress_callback=None,
+                          since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Fetch all pull requests from a repository, or only those updated since a given time."""
         try:
             print(
                 f"[GitHub API] Fetching pull requests from {owner}/{repo_name}...")
             repo = self.github.get_repo(f"{owner}/{repo_name}")
-            prs = repo.get_pulls(state=state)
+            if since:
+                # The pulls endpoint has no since filter; walk newest-updated first and stop at the cutoff
+                prs = repo.get_pulls(
+                    state=state, sort="updated", direction="desc")
+            else:
+                prs = repo.get_pulls(state=state)
 
-            # Get total count if available
-            try:
-                total_count = prs.totalCount
-                print(f"[GitHub API] Found {total_count} total pull requests")
-                if progress_callback:
-                    progress_callback(0, total_count, "pull requests")
-            except:
-                total_count = None
+            # Get total count if available (an incremental fetch stops early, so it has none)
+            total_count = None
+            if not since:
+                try:
+                    total_count = prs.totalCount
+                    print(
+                        f"[GitHub API] Found {total_count} total pull requests")
+                    if progress_callback:
+                        progress_callback(0, total_count, "pull requests")
+                except:
+                    total_count = None
 
             pr_data = []
             pr_count = 0
             for pr in prs:
+                self._throttle()
+                if since and pr.updated_at < since:
+                    break
                 pr_count += 1
                 print(
                     f"[GitHub API] Processed {pr_count} pull requests...")
@@ -229,12 +292,14 @@ class GitHubClient:
             print(f"[GitHub API] ✗ Failed to fetch pull requests: {e}")
             raise ValueError(f"Could not fetch pull requests: {e}")
 
-    def get_issues(self, owner: str, repo_name: str, state: str = "all", progress_callback=None) -> List[Dict[str, Any]]:
-        """Fetch all issues from a repository (excluding PRs)."""
+    def get_issues(self, owner: str, repo_name: str, state: str = "all", progress_callback=None,
+                   since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Fetch all issues from a repository (excluding PRs), or only those updated since a given time."""
         try:
             print(f"[GitHub API] Fetching issues from {owner}/{repo_name}...")
             repo = self.github.get_repo(f"{owner}/{repo_name}")
-            issues = repo.get_issues(state=state)
+            issues = repo.get_issues(
+                state=state, since=since) if since else repo.get_issues(state=state)
 
             # Note: GitHub's issues endpoint includes PRs, so we need to filter them out
             # We'll track progress as we go since we can't get an accurate count upfront
@@ -243,6 +308,7 @@ class GitHubClient:
             issue_data = []
             issue_count = 0
             for issue in issues:
+                self._throttle()
                 # Skip pull requests (they show up in issues API)
                 if issue.pull_request:
                     continue
@@ -350,135 +416,221 @@ class GitHubClient:
         except GithubException as e:
             raise ValueError(f"Could not fetch PR comments: {e}")
 
-    def get_all_pr_comments(self, owner: str, repo_name: str, pr_numbers: List[int], progress_callback=None) -> Dict[int, List[Dict[str, Any]]]:
-        """Fetch all comments (issue comments + review comments) for multiple PRs.
-
-        Args:
-            owner: Repository owner
-            repo_name: Repository name
-            pr_numbers: List of PR numbers to fetch comments for
-            progress_callback: Optional callback(current, total, pr_number) for progress updates
+    @staticmethod
+    def _graphql_comment(node: Dict[str, Any], comment_type: Optional[str] = None) -> Dict[str, Any]:
+        """Convert a GraphQL comment node to the REST comment dict shape."""
+        author = node.get("author")
+        username = author["login"] if author else "unknown"
+        # REST reports app accounts as "name[bot]", GraphQL as plain "name"
+        if author and author.get("__typename") == "Bot":
+            username += "[bot]"
+
+        comment = {
+            "comment_id": node["databaseId"],
+            "username": username,
+            "body": node.get("body") or "",
+            "created_at": datetime.fromisoformat(node["createdAt"].replace("Z", "+00:00")),
+        }
+        if comment_type:
+            comment["comment_type"] = comment_type
+        return comment
+
+    def _graphql_item_comments(self, item: Dict[str, Any], kind: str) -> Optional[List[Dict[str, Any]]]:
+        """Extract comments for one PR/issue, or None if a connection was truncated."""
+        connection = item["comments"]
+        if len(connection["nodes"]) < connection["totalCount"]:
+            return None
+
+        if kind == "issue":
+            return [self._graphql_comment(node) for node in connection["nodes"]]
+
+        comments = [self._graphql_comment(node, "issue_comment")
+                    for node in connection["nodes"]]
+
+        threads = item["reviewThreads"]
+        if len(threads["nodes"]) < threads["totalCount"]:
+            return None
+        for thread in threads["nodes"]:
+            thread_comments = thread["comments"]
+            if len(thread_comments["nodes"]) < thread_comments["totalCount"]:
+                return None
+            comments.extend(self._graphql_comment(node, "review_comment")
+                            for node in thread_comments["nodes"])
+
+        return comments
+
+    def _graphql_comment_batch(self, owner: str, repo_name: str, batch: List[int],
+                               kind: str) -> Dict[int, List[Dict[str, Any]]]:
+        """Fetch comments for one batch of PRs or issues with a single GraphQL query.
 
         Returns:
-            Dict mapping PR number to list of comments
+            Dict mapping number to list of comments, omitting numbers whose comments
+            could not be fetched completely
         """
+        field, fields = ("pullRequest", GRAPHQL_PR_FIELDS) if kind == "pr" else (
+            "issue", GRAPHQL_ISSUE_FIELDS)
+        selections = " ".join(
+            f"n{number}: {field}(number: {int(number)}) {{ {fields} }}" for number in batch)
+        query = ("query($owner: String!, $name: String!) { "
+                 f"repository(owner: $owner, name: $name) {{ {selections} }} }}")
+
+        batch_comments = {}
         try:
-            repo = self.github.get_repo(f"{owner}/{repo_name}")
-            all_comments = {}
-            total = len(pr_numbers)
+            for attempt in range(1, GRAPHQL_MAX_ATTEMPTS + 1):
+                self.rate_limiter.acquire()
+                response = self._graphql_session.post(
+                    GRAPHQL_URL,
+                    json={"query": query, "variables": {
+                        "owner": owner, "name": repo_name}},
+                    timeout=60,
+                )
+                if not self.rate_limiter.note_response(response.headers, response.status_code):
+                    break
+                print(
+                    f"[GitHub API] GraphQL comment batch rate limited "
+                    f"(attempt {attempt}/{GRAPHQL_MAX_ATTEMPTS})")
+            response.raise_for_status()
+            repository = (response.json().get("data") or {}).get("repository") or {}
+
+            for number in batch:
+                item = repository.get(f"n{number}")
+                if item:
+                    comments = self._graphql_item_comments(item, kind)
+                    if comments is not None:
+                        batch_comments[number] = comments
+        except Exception as e:
+            print(
+                f"[GitHub API] GraphQL comment batch failed, falling back to REST: {e}")
 
-            for idx, pr_number in enumerate(pr_numbers, 1):
-                try:
-                    pr = repo.get_pull(pr_number)
-                    comments = []
-
-                    # Get issue comments (general PR comments)
-                    for comment in pr.get_issue_comments():
-                        try:
-                            user = comment.user
-                            comments.append({
-                                "comment_id": comment.id,
-                                "username": user.login if user else "unknown",
-                                "body": comment.body or "",
-                                "created_at": comment.created_at,
-                                "comment_type": "issue_comment"
-                            })
-                        except Exception as e:
-                            print(
-                                f"[GitHub API] Error processing issue comment: {e}")
-                            continue
-
-                    # Get review comments (inline code comments)
-                    for comment in pr.get_review_comments():
-                        try:
-                            user = comment.user
-                            comments.append({
-                                "comment_id": comment.id,
-                                "username": user.login if user else "unknown",
-                                "body": comment.body or "",
-                                "created_at": comment.created_at,
-                                "comment_type": "review_comment"
-                            })
-                        except Exception as e:
-                            print(
-                                f"[GitHub API] Error processing review comment: {e}")
-                            continue
-
-                    all_comments[pr_number] = comments
-
-                    # Update progress after fetching each PR's comments
-                    if progress_callback:
-                        progress_callback(idx, total, pr_number)
+        return batch_comments
 
-                except Exception as e:
-                    print(
-                        f"[GitHub API] Error fetching comments for PR #{pr_number}: {e}")
-                    all_comments[pr_number] = []
+    @staticmethod
+    def _rest_pr_comments(repo, pr_number: int) -> List[Dict[str, Any]]:
+        """Fetch issue comments and review comments for one PR over REST."""
+        pr = repo.get_pull(pr_number)
+        comments = []
 
-                    # Still update progress even on error
-                    if progress_callback:
-                        progress_callback(idx, total, pr_number)
+        # Get issue comments (general PR comments)
+        for comment in pr.get_issue_comments():
+            try:
+                user = comment.user
+                comments.append({
+                    "comment_id": comment.id,
+                    "username": user.login if user else "unknown",
+                    "body": comment.body or "",
+                    "created_at": comment.created_at,
+                    "comment_type": "issue_comment"
+                })
+            except Exception as e:
+                print(
+                    f"[GitHub API] Error processing issue comment: {e}")
+                continue
 
-            return all_comments
-        except GithubException as e:
-            print(f"[GitHub API] ✗ Failed to fetch PR comments: {e}")
-            raise ValueError(f"Could not fetch PR comments: {e}")
+        # Get review comments (inline code comments)
+        for comment in pr.get_review_comments():
+            try:
+                user = comment.user
+                comments.append({
+                    "comment_id": comment.id,
+                    "username": user.login if user else "unknown",
+                    "body": comment.body or "",
+                    "created_at": comment.created_at,
+                    "comment_type": "review_comment"
+                })
+            except Exception as e:
+                print(
+                    f"[GitHub API] Error processing review comment: {e}")
+                continue
+
+        return comments
+
+    @staticmethod
+    def _rest_issue_comments(repo, issue_number: int) -> List[Dict[str, Any]]:
+        """Fetch comments for one issue over REST."""
+        issue = repo.get_issue(issue_number)
+        comments = []
+
+        for comment in issue.get_comments():
+            try:
+                user = comment.user
+                comments.append({
+                    "comment_id": comment.id,
+                    "username": user.login if user else "unknown",
+                    "body": comment.body or "",
+                    "created_at": comment.created_at,
+                })
+            except Exception as e:
+                print(
+                    f"[GitHub API] Error processing comment: {e}")
+                continue
+
+        return comments
+
+    def _iter_comments(self, owner: str, repo_name: str, numbers: List[int], kind: str,
+                       fetch_rest) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Yield (number, comments) per PR/issue: GraphQL batches first, then REST for the rest.
+
+        comments is None when the REST fetch for that item failed.
+        """
+        remaining = []
+        for start in range(0, len(numbers), GRAPHQL_BATCH_SIZE):
+            batch = numbers[start:start + GRAPHQL_BATCH_SIZE]
+            batch_comments = self._graphql_comment_batch(
+                owner, repo_name, batch, kind)
+            for number in batch:
+                if number in batch_comments:
+                    yield number, batch_comments[number]
+                else:
+                    remaining.append(number)
+
+        if not remaining:
+            return
+
+        label = "PR" if kind == "pr" else "issue"
+        print(
+            f"[GitHub API] Fetching comments for {len(remaining)} {label}s over REST")
+        repo = self.github.get_repo(f"{owner}/{repo_name}")
+
+        for number in remaining:
+            self._throttle()
+            try:
+                comments = fetch_rest(repo, number)
+            except Exception as e:
+                print(
+                    f"[GitHub API] Error fetching comments for {label} #{number}: {e}")
+                comments = None
+            yield number, comments
 
-    def get_all_issue_comments(self, owner: str, repo_name: str, issue_numbers: List[int], progress_callback=None) -> Dict[int, List[Dict[str, Any]]]:
-        """Fetch all comments for multiple issues.
+    def iter_pr_comments(self, owner: str, repo_name: str,
+                         pr_numbers: List[int]) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Yield (PR number, comments) pairs as they are fetched.
+
+        Lets callers save comments as they arrive instead of holding every
+        comment of the repository in memory.
 
         Args:
             owner: Repository owner
             repo_name: Repository name
-            issue_numbers: List of issue numbers to fetch comments for
-            progress_callback: Optional callback(current, total, issue_number) for progress updates
+            pr_numbers: List of PR numbers to fetch comments for
 
-        Returns:
-            Dict mapping issue number to list of comments
+        Yields:
+            Tuples of PR number and its issue + review comments
         """
-        try:
-            repo = self.github.get_repo(f"{owner}/{repo_name}")
-            all_comments = {}
-            total = len(issue_numbers)
-
-            for idx, issue_number in enumerate(issue_numbers, 1):
-                try:
-                    issue = repo.get_issue(issue_number)
-                    comments = []
-
-                    for comment in issue.get_comments():
-                        try:
-                            user = comment.user
-                            comments.append({
-                                "comment_id": comment.id,
-                                "username": user.login if user else "unknown",
-                                "body": comment.body or "",
-                                "created_at": comment.created_at,
-                            })
-                        except Exception as e:
-                            print(
-                                f"[GitHub API] Error processing comment: {e}")
-                            continue
-
-                    all_comments[issue_number] = comments
-
-                    # Update progress after fetching each issue's comments
-                    if progress_callback:
-                        progress_callback(idx, total, issue_number)
+        return self._iter_comments(owner, repo_name, pr_numbers, "pr", self._rest_pr_comments)
 
-                except Exception as e:
-                    print(
-                        f"[GitHub API] Error fetching comments for issue #{issue_number}: {e}")
-                    all_comments[issue_number] = []
+    def iter_issue_comments(self, owner: str, repo_name: str,
+                            issue_numbers: List[int]) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Yield (issue number, comments) pairs as they are fetched.
 
-                    # Still update progress even on error
-                    if progress_callback:
-                        progress_callback(idx, total, issue_number)
+        Args:
+            owner: Repository owner
+            repo_name: Repository name
+            issue_numbers: List of issue numbers to fetch comments for
 
-            return all_comments
-        except GithubException as e:
-            print(f"[GitHub API] ✗ Failed to fetch issue comments: {e}")
-            raise ValueError(f"Could not fetch issue comments: {e}")
+        Yields:
+            Tuples of issue number and its comments
+        """
+        return self._iter_comments(owner, repo_name, issue_numbers, "issue", self._rest_issue_comments)
 
     def check_rate_limit(self) -> Dict[str, Any]:
         """Check current GitHub API rate limit."""
@@ -0,0 +1,91 @@
+"""Client-side GitHub rate-limit coordination shared by all fetch threads."""
+
+from typing import Mapping, Optional
+import threading
+import time
+
+
+# Stop issuing requests once fewer than this many remain in the primary window
+MIN_REMAINING = 50
+
+# Backoff for a secondary rate limit that comes without a Retry-After header
+DEFAULT_RETRY_AFTER = 60
+
+
+class RateLimiter:
+    """Pause every fetcher sharing a token while GitHub asks clients to back off.
+
+    Fetch threads call acquire() before each request, which blocks until any
+    backoff has passed. Responses are reported through note_response() (raw
+    HTTP responses) or note_remaining() (PyGithub's last-seen rate-limit state).
+    A low primary budget pauses all fetchers until the window resets, and a
+    secondary-limit 403/429 pauses them for Retry-After seconds.
+    """
+
+    def __init__(self, min_remaining: int = MIN_REMAINING):
+        """Initialize the limiter with no backoff in effect."""
+        self.min_remaining = min_remaining
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def acquire(self):
+        """Block until no backoff is in effect."""
+        while True:
+            with self._lock:
+                delay = self._resume_at - time.time()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def _pause_until(self, resume_at: float, reason: str):
+        """Extend the shared backoff to resume_at (epoch seconds)."""
+        with self._lock:
+            if resume_at <= self._resume_at:
+                return
+            self._resume_at = resume_at
+        print(
+            f"[GitHub API] {reason}; pausing requests for {max(resume_at - time.time(), 0):.0f}s")
+
+    def note_remaining(self, remaining: int, reset_at: Optional[float]):
+        """Record the primary rate-limit budget from the latest response.
+
+        Args:
+            remaining: Requests left in the current window (negative if unknown)
+            reset_at: Epoch seconds when the window resets
+        """
+        if 0 <= remaining < self.min_remaining and reset_at:
+            self._pause_until(
+                float(reset_at), f"Only {remaining} requests left in the rate-limit window")
+
+    def note_response(self, headers: Mapping[str, str], status_code: int) -> bool:
+        """Record rate-limit headers from a raw HTTP response.
+
+        Args:
+            headers: Response headers
+            status_code: Response HTTP status
+
+        Returns:
+            True if the request was rejected by a rate limit and should be retried
+            after acquire() returns
+        """
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_at = headers.get("X-RateLimit-Reset")
+
+        if status_code in (403, 429):
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                self._pause_until(time.time() + float(retry_after),
+                                  "Secondary rate limit hit")
+                return True
+            if remaining == "0" and reset_at:
+                self._pause_until(float(reset_at), "Rate limit exhausted")
+                return True
+            if status_code == 429:
+                self._pause_until(time.time() + DEFAULT_RETRY_AFTER,
+                                  "Secondary rate limit hit")
+                return True
+            return False
+
+        if remaining is not None:
+            self.note_remaining(int(remaining), reset_at and float(reset_at))
+        return False
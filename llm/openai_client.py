@@ -1,16 +1,27 @@
 """OpenAI client for analyzing text quality."""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
 from openai import OpenAI
 import json
 
 
+# Per-request deadline in seconds, so a hung request can't hold a worker indefinitely
+REQUEST_TIMEOUT = 60.0
+
+# Retries for rate limits, 5xx and timeouts; the SDK backs off exponentially between attempts
+MAX_RETRIES = 3
+
+
 class OpenAIClient:
     """Client for analyzing text quality using OpenAI."""
 
     def __init__(self, api_key: str):
-        """Initialize OpenAI client."""
-        self.client = OpenAI(api_key=api_key)
+        """Initialize OpenAI client.
+
+        Shared per API key through utils.resources.get_llm_client, so the SDK's
+        HTTP connection pool is reused across analyses.
+        """
+        self.client = OpenAI(api_key=api_key, timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES)
         self.model = "gpt-5-nano"  # Using cost-effective model
 
     def analyze_commit_message(self, message: str) -> Dict[str, Any]:
@@ -20,7 +31,8 @@ class OpenAIClient:
             message: The commit message to analyze
 
         Returns:
-            Dict with 'score' (0-10) and 'feedback' (string)
+            Dict with 'score' (0-10) and 'feedback' (string), plus 'error': True
+            if the request failed and the score is only a placeholder
         """
         prompt = f"""Analyze this Git commit message and rate its quality from 0-10.
 
@@ -58,7 +70,7 @@ Respond in JSON format with:
             }
         except Exception as e:
             print(f"Error analyzing commit message: {e}")
-            return {"score": 5.0, "feedback": f"Error during analysis: {str(e)}"}
+            return {"score": 5.0, "feedback": f"Error during analysis: {str(e)}", "error": True}
 
     def analyze_pr_description(self, title: str, body: str) -> Dict[str, Any]:
         """Analyze the quality of a pull request description.
@@ -68,7 +80,8 @@ Respond in JSON format with:
             body: The PR description body
 
         Returns:
-            Dict with 'score' (0-10) and 'feedback' (string)
+            Dict with 'score' (0-10) and 'feedback' (string), plus 'error': True
+            if the request failed and the score is only a placeholder
         """
         prompt = f"""Analyze this Pull Request and rate its description quality from 0-10.
 
@@ -108,7 +121,90 @@ Respond in JSON format with:
             }
         except Exception as e:
             print(f"Error analyzing PR description: {e}")
-            return {"score": 5.0, "feedback": f"Error during analysis: {str(e)}"}
+            return {"score": 5.0, "feedback": f"Error during analysis: {str(e)}", "error": True}
+
+    def analyze_pr_descriptions_batch(self, items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Analyze the quality of several pull request descriptions in one request.
+
+        Items missing from a successful response fall back to individual
+        analyze_pr_description calls. If the request itself fails, every item
+        gets an error result instead, so an outage or rate limit costs one
+        failed call rather than one per item.
+
+        Args:
+            items: List of (title, body) tuples
+
+        Returns:
+            List of dicts with 'score' (0-10) and 'feedback' (string), in input order,
+            plus 'error': True on items that could not be scored
+        """
+        if not items:
+            return []
+
+        pr_sections = "\n\n".join(
+            f"""### PR {index}
+PR Title: {title}
+
+PR Description:
+{body if body else "(No description provided)"}"""
+            for index, (title, body) in enumerate(items)
+        )
+
+        prompt = f"""Analyze each of the following Pull Requests and rate its description quality from 0-10.
+
+Consider:
+- Clarity: Is it clear what changes are being made?
+- Context: Does it explain the purpose and reasoning?
+- Completeness: Does it include testing information, breaking changes, etc.?
+- Structure: Is it well-organized and easy to understand?
+
+{pr_sections}
+
+Respond in JSON format with one entry per PR:
+{{"results": [{{"index": <PR number above>, "score": <number 0-10>, "feedback": "<brief explanation of the score in bullet points>"}}]}}"""
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"}
+            )
+        except Exception as e:
+            print(f"Error analyzing PR description batch: {e}")
+            return [{"score": 5.0, "feedback": f"Error during analysis: {str(e)}", "error": True}
+                    for _ in items]
+
+        try:
+            parsed = json.loads(response.choices[0].message.content)
+
+            for entry in parsed.get("results", []):
+                index = entry.get("index")
+                if not isinstance(index, int) or not 0 <= index < len(items):
+                    continue
+
+                # Ensure feedback is a string (LLM sometimes returns a list)
+                feedback = entry.get("feedback", "No feedback available")
+                if isinstance(feedback, list):
+                    feedback = "\n".join(str(item) for item in feedback)
+                elif not isinstance(feedback, str):
+                    feedback = str(feedback)
+
+                results[index] = {
+                    "score": float(entry.get("score", 5)),
+                    "feedback": feedback,
+                }
+        except Exception as e:
+            print(f"Error parsing PR description batch response: {e}")
+
+        # Fall back to one request per PR for anything the batch didn't cover
+        for index, result in enumerate(results):
+            if result is None:
+                title, body = items[index]
+                results[index] = self.analyze_pr_description(title, body)
+
+        return results
 
     def analyze_issue_description(self, title: str, body: str) -> Dict[str, Any]:
         """Analyze the quality of an issue description.
@@ -118,7 +214,8 @@ Respond in JSON format with:
             body: The issue description body
 
         Returns:
-            Dict with 'score' (0-10) and 'feedback' (string)
+            Dict with 'score' (0-10) and 'feedback' (string), plus 'error': True
+            if the request failed and the score is only a placeholder
         """
         prompt = f"""Analyze this GitHub Issue and rate its description quality from 0-10.
 
@@ -158,7 +255,7 @@ Respond in JSON format with:
             }
         except Exception as e:
             print(f"Error analyzing issue description: {e}")
-            return {"score": 5.0, "feedback": f"Error during analysis: {str(e)}"}
+            return {"score": 5.0, "feedback": f"Error during analysis: {str(e)}", "error": True}
 
     def batch_analyze(self, items: list, item_type: str) -> list:
         """Batch analyze multiple items.
@@ -3,7 +3,7 @@
 import streamlit as st
 import time
 from database import DatabaseManager
-from routes import navigate_to_home, navigate_to_repo, get_repo_url_from_analyze_page
+from routes import navigate_to_home, navigate_to_repo, get_repo_url_from_analyze_page, is_full_refetch_requested
 from utils.validators import validate_api_keys
 from utils.analysis import analyze_repository
 
@@ -39,7 +39,8 @@ def display_analyze_page(db_manager: DatabaseManager):
     repo_id, repo_info = analyze_repository(
         repo_url,
         st.session_state.github_token,
-        st.session_state.openai_key
+        st.session_state.openai_key,
+        full_refetch=is_full_refetch_requested(),
     )
 
     if repo_id and repo_info:
@@ -31,7 +31,8 @@ def display_repository_dashboard(db_manager: DatabaseManager, repo_record):
     ])
 
     with tab1:
-        display_contributor_stats(db_manager, repo_record.id)
+        display_contributor_stats(
+            db_manager, repo_record.id, repo_record.last_analyzed)
 
     with tab2:
         display_pull_requests(
@@ -92,13 +92,19 @@ def display_home_page(db_manager: DatabaseManager):
         st.write("")
         analyze_button = st.button("🚀 Analyze Repository", type="primary", use_container_width=True)
 
+    full_refetch = st.checkbox(
+        "Full re-fetch",
+        help="Fetch all commits, pull requests and issues again instead of only changes since the last analysis",
+        key="full_refetch",
+    )
+
     if analyze_button:
         if not repo_url:
             st.error("❌ Please enter a repository URL")
         elif key_errors:
             st.error("❌ Please provide both API keys before analyzing")
         else:
-            navigate_to_analyze_page(repo_url)
+            navigate_to_analyze_page(repo_url, full_refetch)
             st.rerun()
 
     st.markdown("---")
@@ -135,7 +141,7 @@ def display_home_page(db_manager: DatabaseManager):
                     if key_errors:
                         st.error("❌ Please provide both API keys before re-analyzing")
                     else:
-                        navigate_to_analyze_page(repo.url)
+                        navigate_to_analyze_page(repo.url, full_refetch)
                         st.rerun()
 
             st.markdown("---")
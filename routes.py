@@ -16,10 +16,12 @@ def navigate_to_repo(owner: str, repo: str):
     st.query_params["repo"] = repo
 
 
-def navigate_to_analyze_page(repo_url: str):
+def navigate_to_analyze_page(repo_url: str, full_refetch: bool = False):
     """Navigate to the analyze page with a repository URL."""
     st.query_params["page"] = "analyse"
     st.query_params["url"] = repo_url
+    if full_refetch:
+        st.query_params["full"] = "1"
 
 
 def is_on_home_page() -> bool:
@@ -39,6 +41,11 @@ def get_repo_url_from_analyze_page() -> Optional[str]:
     return st.query_params.get("url")
 
 
+def is_full_refetch_requested() -> bool:
+    """Check if the analyze page should fetch everything instead of only recent changes."""
+    return st.query_params.get("full") == "1"
+
+
 def get_repo_from_url(db_manager):
     """Get repository from URL query parameters.
 
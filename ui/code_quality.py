@@ -238,11 +238,3 @@ def display_code_quality(db_manager: DatabaseManager, repo_id: int):
         st.caption("Test files are detected based on naming conventions: test_*.py, *_test.py, or files in tests/ directories")
 
     st.caption(f"Last analyzed: {metrics['analyzed_at'].strftime('%Y-%m-%d %H:%M:%S')}")
-
-    with st.expander("🔬 View Detailed File-Level Metrics"):
-        if metrics.get('file_quality_details'):
-            try:
-                file_details = json.loads(metrics['file_quality_details'])
-                st.json(file_details)
-            except:
-                st.text("File-level details not available")
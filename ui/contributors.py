@@ -1,40 +1,66 @@
 """Contributor statistics display UI."""
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from database import DatabaseManager
 
+# Contributors drawn in the per-contributor bar charts by default
+TOP_N_PLOTTED = 25
 
-def display_contributor_stats(db_manager: DatabaseManager, repo_id: int):
-    """Display comprehensive contributor statistics."""
-    st.header("👥 Contributor Analysis")
 
-    stats = db_manager.get_contributor_stats(repo_id)
+def _share_percent(values: np.ndarray) -> np.ndarray:
+    """Each value's share of the column total as a percentage (0 when the total is 0)."""
+    total = values.sum()
+    return np.divide(values, total, out=np.zeros(len(values)), where=total != 0) * 100
+
+
+@st.cache_data(ttl=3600)
+def compute_contributor_frame(_db_manager: DatabaseManager, repo_id: int, last_analyzed=None) -> pd.DataFrame:
+    """Build the contributor DataFrame with derived totals and scores.
+
+    Cached per repository; last_analyzed is only part of the cache key. Since a
+    partial re-fetch leaves last_analyzed unchanged, utils.analysis also clears
+    this cache whenever an analysis run finishes.
+    """
+    stats = _db_manager.get_contributor_stats(repo_id)
 
     if not stats:
-        st.info("No contributor data available")
-        return
+        return pd.DataFrame()
 
     df = pd.DataFrame(stats)
 
-    df["total_lines_changed"] = df["total_additions"] + df["total_deletions"]
-    df["total_contributions"] = df["commit_count"] + df["pr_count"] + df["issue_count"]
-    df["net_additions"] = df["total_additions"] - df["total_deletions"]
+    additions = df["total_additions"].to_numpy(dtype=np.int64)
+    deletions = df["total_deletions"].to_numpy(dtype=np.int64)
+    commits = df["commit_count"].to_numpy(dtype=np.int64)
+    prs = df["pr_count"].to_numpy(dtype=np.int64)
+    issues = df["issue_count"].to_numpy(dtype=np.int64)
+    lines = additions + deletions
+
+    df = df.assign(
+        total_lines_changed=lines,
+        total_contributions=commits + prs + issues,
+        net_additions=additions - deletions,
+        commit_score=_share_percent(commits),
+        pr_score=_share_percent(prs),
+        issue_score=_share_percent(issues),
+        code_volume_score=_share_percent(lines),
+    )
+
+    return df.sort_values("total_contributions", ascending=False)
 
-    if len(df) > 0:
-        total_commits = df["commit_count"].sum()
-        total_prs = df["pr_count"].sum()
-        total_issues = df["issue_count"].sum()
-        total_code = df["total_lines_changed"].sum()
 
-        df["commit_score"] = (df["commit_count"] / total_commits * 100) if total_commits > 0 else 0
-        df["pr_score"] = (df["pr_count"] / total_prs * 100) if total_prs > 0 else 0
-        df["issue_score"] = (df["issue_count"] / total_issues * 100) if total_issues > 0 else 0
-        df["code_volume_score"] = (df["total_lines_changed"] / total_code * 100) if total_code > 0 else 0
+def display_contributor_stats(db_manager: DatabaseManager, repo_id: int, last_analyzed=None):
+    """Display comprehensive contributor statistics."""
+    st.header("👥 Contributor Analysis")
+
+    df = compute_contributor_frame(db_manager, repo_id, last_analyzed)
 
-    df = df.sort_values("total_contributions", ascending=False)
+    if df.empty:
+        st.info("No contributor data available")
+        return
 
     st.subheader("📊 Overview")
     col1, col2, col3, col4 = st.columns(4)
@@ -83,26 +109,37 @@ def display_contributor_stats(db_manager: DatabaseManager, repo_id: int):
     ]
 
     numeric_cols = ["Lines +", "Lines -", "Net Lines"]
-    for col in numeric_cols:
-        display_df[col] = display_df[col].fillna(0)
-
-    quality_cols = ["PR Quality", "Issue Quality"]
-    for col in quality_cols:
-        display_df[col] = display_df[col].apply(
-            lambda x: "N/A" if pd.isna(x) or x is None else f"{x:.1f}")
+    display_df[numeric_cols] = display_df[numeric_cols].fillna(0)
 
+    # Quality columns stay numeric (so they sort as numbers); missing scores render as N/A
     st.dataframe(
         display_df.style.format({
             "Lines +": "{:,.0f}",
             "Lines -": "{:,.0f}",
             "Net Lines": "{:+,.0f}",
-        }),
+            "PR Quality": "{:.1f}",
+            "Issue Quality": "{:.1f}",
+        }, na_rep="N/A"),
         use_container_width=True,
         hide_index=True,
     )
 
     st.subheader("🎯 Multi-Dimensional Contributor Comparison")
 
+    # Per-contributor charts are capped to the most active contributors unless asked otherwise
+    plot_df = df
+    if len(df) > TOP_N_PLOTTED:
+        if not st.toggle(f"Show all {len(df)} contributors in charts (top {TOP_N_PLOTTED} shown)"):
+            plot_df = df.head(TOP_N_PLOTTED)
+
+    # Column arrays shared by the bar charts, extracted once
+    usernames = plot_df["username"].to_numpy()
+    commit_counts = plot_df["commit_count"].to_numpy()
+    pr_counts = plot_df["pr_count"].to_numpy()
+    issue_counts = plot_df["issue_count"].to_numpy()
+    additions = plot_df["total_additions"].to_numpy()
+    deletions = plot_df["total_deletions"].to_numpy()
+
     col1, col2 = st.columns(2)
 
     with col1:
@@ -136,20 +173,20 @@ def display_contributor_stats(db_manager: DatabaseManager, repo_id: int):
 
         fig_stacked.add_trace(go.Bar(
             name="Commits",
-            x=df["username"],
-            y=df["commit_count"],
+            x=usernames,
+            y=commit_counts,
             marker_color="lightblue",
         ))
         fig_stacked.add_trace(go.Bar(
             name="PRs",
-            x=df["username"],
-            y=df["pr_count"],
+            x=usernames,
+            y=pr_counts,
             marker_color="lightgreen",
         ))
         fig_stacked.add_trace(go.Bar(
             name="Issues",
-            x=df["username"],
-            y=df["issue_count"],
+            x=usernames,
+            y=issue_counts,
             marker_color="lightsalmon",
         ))
 
@@ -167,14 +204,14 @@ def display_contributor_stats(db_manager: DatabaseManager, repo_id: int):
     fig_lines = go.Figure()
     fig_lines.add_trace(go.Bar(
         name="Additions",
-        x=df["username"],
-        y=df["total_additions"],
+        x=usernames,
+        y=additions,
         marker_color="green",
     ))
     fig_lines.add_trace(go.Bar(
         name="Deletions",
-        x=df["username"],
-        y=df["total_deletions"],
+        x=usernames,
+        y=deletions,
         marker_color="red",
     ))
     fig_lines.update_layout(
@@ -187,17 +224,17 @@ def display_contributor_stats(db_manager: DatabaseManager, repo_id: int):
 
     st.subheader("⭐ Quality Analysis")
 
-    quality_data = []
-    for _, row in df.iterrows():
-        if pd.notna(row["avg_pr_quality"]):
-            quality_data.append(
-                {"Contributor": row["username"], "Type": "PR", "Score": row["avg_pr_quality"]})
-        if pd.notna(row["avg_issue_quality"]):
-            quality_data.append(
-                {"Contributor": row["username"], "Type": "Issue", "Score": row["avg_issue_quality"]})
-
-    if quality_data:
-        df_quality = pd.DataFrame(quality_data)
+    # Long format, one row per (contributor, type) with a score, in contributor order
+    df_quality = (
+        plot_df[["username", "avg_pr_quality", "avg_issue_quality"]]
+        .reset_index(drop=True)
+        .rename(columns={"username": "Contributor", "avg_pr_quality": "PR", "avg_issue_quality": "Issue"})
+        .melt(id_vars="Contributor", var_name="Type", value_name="Score", ignore_index=False)
+        .sort_index(kind="stable")
+        .dropna(subset=["Score"])
+    )
+
+    if not df_quality.empty:
         fig_quality = px.bar(
             df_quality,
             x="Contributor",
@@ -4,7 +4,7 @@ import streamlit as st
 import pandas as pd
 from database import DatabaseManager
 from database.models import Issue, IssueMetric
-from llm import OpenAIClient
+from utils.resources import get_llm_client
 from analyzers import IssueAnalyzer
 
 
@@ -12,7 +12,7 @@ def display_issues(db_manager: DatabaseManager, repo_id: int, owner: str, repo_n
     """Display issues list with metrics."""
     st.header("🐛 Issues")
 
-    llm_client = OpenAIClient(openai_key)
+    llm_client = get_llm_client(openai_key)
     issue_analyzer = IssueAnalyzer(db_manager, llm_client)
     issue_stats = issue_analyzer.get_issue_statistics(repo_id)
 
@@ -6,7 +6,7 @@ import json
 from sqlalchemy.orm import aliased
 from database import DatabaseManager
 from database.models import PullRequest, PRMetric, Contributor
-from llm import OpenAIClient
+from utils.resources import get_llm_client
 from analyzers import PRAnalyzer
 
 
@@ -14,24 +14,26 @@ def display_pull_requests(db_manager: DatabaseManager, repo_id: int, owner: str,
     """Display pull requests list with metrics."""
     st.header("🔀 Pull Requests")
 
-    llm_client = OpenAIClient(openai_key)
+    llm_client = get_llm_client(openai_key)
     pr_analyzer = PRAnalyzer(db_manager, llm_client)
-    pr_stats = pr_analyzer.get_pr_statistics(repo_id)
-
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.metric("Total PRs", pr_stats['total_prs'])
-    with col2:
-        st.metric("Avg Comments", f"{pr_stats['avg_comments']:.1f}")
-    with col3:
-        st.metric("PRs with Issue Links", f"{pr_stats['percentage_linked']:.1f}%")
-    with col4:
-        if pr_stats['avg_description_quality']:
-            st.metric("Average PR Description Quality", f"{pr_stats['avg_description_quality']}/10")
 
+    # One session for the statistics and the PR list, so the page checks out a single connection
     session = db_manager.get_session()
     try:
+        pr_stats = pr_analyzer.get_pr_statistics(repo_id, session=session)
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("Total PRs", pr_stats['total_prs'])
+        with col2:
+            st.metric("Avg Comments", f"{pr_stats['avg_comments']:.1f}")
+        with col3:
+            st.metric("PRs with Issue Links", f"{pr_stats['percentage_linked']:.1f}%")
+        with col4:
+            if pr_stats['avg_description_quality']:
+                st.metric("Average PR Description Quality", f"{pr_stats['avg_description_quality']}/10")
+
         OpenerContributor = aliased(Contributor)
         MergerContributor = aliased(Contributor)
 
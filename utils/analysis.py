@@ -2,18 +2,20 @@
 
 import streamlit as st
 import json
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from github_client import GitHubClient
 from database import DatabaseManager
+from utils.resources import get_db_manager, get_github_client, get_llm_client
 from llm import OpenAIClient
 from analyzers import CommitAnalyzer, PRAnalyzer, IssueAnalyzer
-from analyzers.repository_analyzer import RepositoryAnalyzer
+from analyzers.repository_analyzer import RepositoryAnalyzer, ANALYZER_VERSION
 from database.models import PullRequest, Issue
 
 
 def _create_progress_callbacks():
-    """Create progress callback functions for data fetching."""
+    """Create progress callback functions for data fetching and analysis."""
     commit_state = {"current": 0, "total": 0}
     pr_state = {"current": 0, "total": 0}
     issue_state = {"current": 0, "total": 0}
@@ -37,11 +39,18 @@ def _create_progress_callbacks():
             update_commit_progress, update_pr_progress, update_issue_progress)
 
 
-def _fetch_repository_data(github_client: GitHubClient, owner: str, repo_name: str):
+def _fetch_repository_data(github_client: GitHubClient, owner: str, repo_name: str,
+                           since: Optional[datetime] = None, known_shas: Optional[set] = None):
     """Fetch commits, PRs, and issues in parallel.
 
+    Args:
+        since: When set, only fetch PRs and issues updated after this time
+        known_shas: Commits already stored; they are listed but not fetched in detail.
+            Commits are always listed in full, since a merge can bring in commits
+            dated before any time cutoff.
+
     Returns:
-        tuple: (commits, prs, issues)
+        tuple: (commits, prs, issues, complete) where complete is False if any fetch failed
     """
     commit_state, pr_state, issue_state, cb_commit, cb_pr, cb_issue = _create_progress_callbacks()
 
@@ -70,14 +79,15 @@ def _fetch_repository_data(github_client: GitHubClient, owner: str, repo_name: s
             issue_status = st.empty()
 
         commits, prs, issues = [], [], []
+        failed = []
 
         with ThreadPoolExecutor(max_workers=30) as executor:
             future_commits = executor.submit(
-                github_client.get_commits, owner, repo_name, None, cb_commit)
+                github_client.get_commits, owner, repo_name, None, cb_commit, known_shas)
             future_prs = executor.submit(
-                github_client.get_pull_requests, owner, repo_name, "all", cb_pr)
+                github_client.get_pull_requests, owner, repo_name, "all", cb_pr, since)
             future_issues = executor.submit(
-                github_client.get_issues, owner, repo_name, "all", cb_issue)
+                github_client.get_issues, owner, repo_name, "all", cb_issue, since)
 
             futures = {
                 future_commits: "commits",
@@ -86,286 +96,314 @@ def _fetch_repository_data(github_client: GitHubClient, owner: str, repo_name: s
             }
 
             completed = 0
-            while completed < 3:
-                if commit_state["total"] > 0:
+            pending = set(futures)
+            while pending:
+                # Wake as soon as a fetch finishes, or every half second to refresh progress
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+
+                if future_commits in pending and commit_state["total"] > 0:
                     progress = min(
                         commit_state["current"] / commit_state["total"], 1.0)
                     commit_progress_bar.progress(progress)
                     commit_status.text(
                         f"{commit_state['current']}/{commit_state['total']} ({progress*100:.0f}%)")
 
-                if pr_state["total"] > 0:
+                if future_prs in pending and pr_state["total"] > 0:
                     progress = min(pr_state["current"] /
                                    pr_state["total"], 1.0)
                     pr_progress_bar.progress(progress)
                     pr_status.text(
                         f"{pr_state['current']}/{pr_state['total']} ({progress*100:.0f}%)")
 
-                if issue_state["total"] > 0:
+                if future_issues in pending and issue_state["total"] > 0:
                     issue_progress_bar.progress(0.5)
                     issue_status.text(
                         f"Processing... {issue_state['current']} issues found")
 
-                for future in list(futures.keys()):
-                    if future.done() and future in futures:
-                        data_type = futures[future]
-                        try:
-                            result = future.result()
-                            if data_type == "commits":
-                                commits = result
-                                commit_progress_bar.progress(1.0)
-                                commit_status.text(f"✅ {len(commits)} commits")
-                            elif data_type == "pull requests":
-                                prs = result
-                                pr_progress_bar.progress(1.0)
-                                pr_status.text(f"✅ {len(prs)} PRs")
-                            elif data_type == "issues":
-                                issues = result
-                                issue_progress_bar.progress(1.0)
-                                issue_status.text(f"✅ {len(issues)} issues")
-                            completed += 1
-                            progress_pct = completed / 3
-                            fetch_progress.progress(progress_pct)
-                            fetch_status.text(
-                                f"Progress: {completed}/3 data types ({progress_pct*100:.0f}%)")
-                            del futures[future]
-                        except Exception as e:
-                            st.error(f"❌ Error fetching {data_type}: {str(e)}")
-                            completed += 1
-                            del futures[future]
-
-                time.sleep(0.1)
-
-        status.update(label="✅ Data fetching complete", state="complete")
+                for future in done:
+                    data_type = futures[future]
+                    try:
+                        result = future.result()
+                        if data_type == "commits":
+                            commits = result
+                            commit_progress_bar.progress(1.0)
+                            commit_status.text(f"✅ {len(commits)} commits")
+                        elif data_type == "pull requests":
+                            prs = result
+                            pr_progress_bar.progress(1.0)
+                            pr_status.text(f"✅ {len(prs)} PRs")
+                        elif data_type == "issues":
+                            issues = result
+                            issue_progress_bar.progress(1.0)
+                            issue_status.text(f"✅ {len(issues)} issues")
+                    except Exception as e:
+                        failed.append(data_type)
+                        st.error(f"❌ Error fetching {data_type}: {str(e)}")
+
+                    completed += 1
+                    progress_pct = completed / 3
+                    fetch_progress.progress(progress_pct)
+                    fetch_status.text(
+                        f"Progress: {completed}/3 data types ({progress_pct*100:.0f}%)")
+
+        if failed:
+            status.update(
+                label=f"⚠️ Data fetching incomplete ({', '.join(failed)} failed)", state="error")
+        else:
+            status.update(label="✅ Data fetching complete", state="complete")
 
-    return commits, prs, issues
+    return commits, prs, issues, not failed
 
 
 def _analyze_data(db_manager: DatabaseManager, repo_record,
                   commits: list, prs: list, issues: list, llm_client: OpenAIClient):
     """Analyze fetched commits, PRs, and issues."""
-    if commits:
-        with st.status(f"📝 Analyzing {len(commits)} commits...", expanded=True) as status:
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-
-            def commit_progress(current, total, message):
-                progress = current / total
-                progress_bar.progress(progress)
-                status_text.text(
-                    f"Progress: {current}/{total} ({progress*100:.1f}%)")
-
-            commit_analyzer = CommitAnalyzer(db_manager, llm_client)
-            commit_analyzer.analyze_commits(
-                repo_record.id, commits, commit_progress)
-            status.update(
-                label=f"✅ Analyzed {len(commits)} commits", state="complete")
+    # Resolve every author, merger and reporter to a contributor id once for the whole run
+    contributor_ids = db_manager.get_or_create_contributors(
+        [commit_data["contributor"] for commit_data in commits] +
+        [pr_data["contributor"] for pr_data in prs] +
+        [pr_data["merged_by"] for pr_data in prs if pr_data.get("merged_by")] +
+        [issue_data["contributor"] for issue_data in issues])
 
-    if prs:
-        with st.status(f"🔀 Analyzing {len(prs)} pull requests...", expanded=True) as status:
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-
-            def pr_progress(current, total, message):
-                progress = current / total
-                progress_bar.progress(progress)
-                status_text.text(
-                    f"Progress: {current}/{total} ({progress*100:.1f}%)")
-
-            pr_analyzer = PRAnalyzer(db_manager, llm_client)
-            pr_analyzer.analyze_pull_requests(repo_record.id, prs, pr_progress)
-            status.update(
-                label=f"✅ Analyzed {len(prs)} pull requests", state="complete")
+    commit_state, pr_state, issue_state, cb_commit, cb_pr, cb_issue = _create_progress_callbacks()
 
+    # The three phases only depend on the fetched data, so they run side by side;
+    # workers report through the shared state dicts and the bars are drawn here
+    phases = []
+    if commits:
+        phases.append({"title": "📝 **Commits**", "label": "commits", "count": len(commits),
+                       "state": commit_state,
+                       "run": lambda: CommitAnalyzer(db_manager, llm_client).analyze_commits(
+                           repo_record.id, commits, cb_commit, contributor_ids=contributor_ids)})
+    if prs:
+        phases.append({"title": "🔀 **Pull Requests**", "label": "pull requests", "count": len(prs),
+                       "state": pr_state,
+                       "run": lambda: PRAnalyzer(db_manager, llm_client).analyze_pull_requests(
+                           repo_record.id, prs, cb_pr, contributor_ids=contributor_ids)})
     if issues:
-        with st.status(f"🐛 Analyzing {len(issues)} issues...", expanded=True) as status:
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-
-            def issue_progress(current, total, message):
-                progress = current / total
-                progress_bar.progress(progress)
-                status_text.text(
-                    f"Progress: {current}/{total} ({progress*100:.1f}%)")
-
-            issue_analyzer = IssueAnalyzer(db_manager, llm_client)
-            issue_analyzer.analyze_issues(
-                repo_record.id, issues, issue_progress)
-            status.update(
-                label=f"✅ Analyzed {len(issues)} issues", state="complete")
+        phases.append({"title": "🐛 **Issues**", "label": "issues", "count": len(issues),
+                       "state": issue_state,
+                       "run": lambda: IssueAnalyzer(db_manager, llm_client).analyze_issues(
+                           repo_record.id, issues, cb_issue, contributor_ids=contributor_ids)})
+
+    if not phases:
+        return
+
+    summary = ", ".join(f"{phase['count']} {phase['label']}" for phase in phases)
+    with st.status(f"🧠 Analyzing {summary}...", expanded=True) as status:
+        for column, phase in zip(st.columns(len(phases)), phases):
+            with column:
+                st.write(phase["title"])
+                phase["progress_bar"] = st.progress(0)
+                phase["status_text"] = st.empty()
+
+        errors = []
+        with ThreadPoolExecutor(max_workers=len(phases)) as executor:
+            futures = {executor.submit(phase["run"]): phase for phase in phases}
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+
+                for future in pending:
+                    phase = futures[future]
+                    state = phase["state"]
+                    if state["total"] > 0:
+                        progress = min(state["current"] / state["total"], 1.0)
+                        phase["progress_bar"].progress(progress)
+                        phase["status_text"].text(
+                            f"Progress: {state['current']}/{state['total']} ({progress*100:.1f}%)")
+
+                for future in done:
+                    phase = futures[future]
+                    try:
+                        future.result()
+                        phase["progress_bar"].progress(1.0)
+                        phase["status_text"].text(
+                            f"✅ Analyzed {phase['count']} {phase['label']}")
+                    except Exception as e:
+                        phase["status_text"].text(
+                            f"❌ Error analyzing {phase['label']}")
+                        errors.append(e)
+
+        if errors:
+            status.update(label="❌ Analysis failed", state="error")
+            raise errors[0]
+
+        status.update(label="✅ Analysis complete", state="complete")
+
+
+def _stream_comment_rows(db_manager: DatabaseManager, comment_pairs, parent_ids: dict, parent_key: str,
+                         save_bulk, state: dict, batch_size: int = 1000) -> int:
+    """Save (number, comments) pairs as they are fetched, batch_size rows per transaction.
+
+    Runs on a worker thread, so progress is only reported through state.
+    Pairs whose comments are None could not be fetched and are counted in
+    state["failed"].
+    Memory is bounded by one batch rather than every comment of the repository.
+
+    Returns:
+        Number of comment rows written
+    """
+    buffer = []
+    saved = 0
+
+    def flush():
+        contributor_ids = db_manager.get_or_create_contributors([
+            {"username": comment["username"], "email": None, "avatar_url": None}
+            for _, comment in buffer
+        ])
+        save_bulk([
+            {
+                parent_key: parent_id,
+                "contributor_id": contributor_ids[comment["username"]],
+                "comment_id": comment["comment_id"],
+                "body": comment["body"],
+                "created_at": comment["created_at"]
+            }
+            for parent_id, comment in buffer
+        ])
+        return len(buffer)
+
+    for number, comments in comment_pairs:
+        state["current"] += 1
+        if comments is None:
+            # The fetch for this item failed
+            state["failed"] += 1
+            continue
+        parent_id = parent_ids.get(number)
+        if parent_id is not None:
+            buffer.extend((parent_id, comment) for comment in comments)
+
+        if len(buffer) >= batch_size:
+            saved += flush()
+            buffer = []
+        state["saved"] = saved + len(buffer)
+
+    if buffer:
+        saved += flush()
+    return saved
 
 
 def _fetch_and_save_comments(db_manager: DatabaseManager, github_client: GitHubClient,
                              repo_record, owner: str, repo_name: str,
-                             prs: list, issues: list) -> int:
-    """Fetch and save PR and issue comments."""
+                             prs: list, issues: list) -> Tuple[int, bool]:
+    """Fetch PR and issue comments and save them in batches as they arrive.
+
+    Returns:
+        tuple: (saved comment count, complete) where complete is False if the comments
+        of any PR or issue could not be fetched, in which case the caller must not
+        advance last_analyzed
+    """
     total_comments = 0
+    complete = True
 
     with st.status("💬 Fetching comments for PRs and issues...", expanded=True) as status:
-        pr_container = st.container()
-        issue_container = st.container()
+        pr_numbers = [pr["pr_number"] for pr in prs]
+        issue_numbers = [issue["issue_number"] for issue in issues]
+
+        # Resolve every parent row up front (the PRs and issues were saved by _analyze_data)
+        session = db_manager.get_session()
+        try:
+            pr_ids = dict(session.query(PullRequest.pr_number, PullRequest.id).filter(
+                PullRequest.repo_id == repo_record.id,
+                PullRequest.pr_number.in_(pr_numbers)
+            ).all()) if pr_numbers else {}
+            issue_ids = dict(session.query(Issue.issue_number, Issue.id).filter(
+                Issue.repo_id == repo_record.id,
+                Issue.issue_number.in_(issue_numbers)
+            ).all()) if issue_numbers else {}
+        finally:
+            session.close()
+
+        jobs = []
+        if pr_numbers:
+            jobs.append({"label": "pull requests", "numbers": pr_numbers,
+                         "pairs": github_client.iter_pr_comments(owner, repo_name, pr_numbers),
+                         "parent_ids": pr_ids, "parent_key": "pr_id",
+                         "save_bulk": db_manager.save_pr_comments_bulk})
+        if issue_numbers:
+            jobs.append({"label": "issues", "numbers": issue_numbers,
+                         "pairs": github_client.iter_issue_comments(owner, repo_name, issue_numbers),
+                         "parent_ids": issue_ids, "parent_key": "issue_id",
+                         "save_bulk": db_manager.save_issue_comments_bulk})
+
+        for job in jobs:
+            st.write(
+                f"📥 Fetching comments for {len(job['numbers'])} {job['label']}...")
+            job["state"] = {"current": 0, "total": len(job["numbers"]), "saved": 0, "failed": 0}
+            job["progress_bar"] = st.progress(0)
+            job["status_text"] = st.empty()
+            job["status_text"].text("⏳ Fetching in progress...")
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+                futures = {
+                    executor.submit(_stream_comment_rows, db_manager, job["pairs"], job["parent_ids"],
+                                    job["parent_key"], job["save_bulk"], job["state"]): job
+                    for job in jobs
+                }
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+
+                    for future in pending:
+                        state = futures[future]["state"]
+                        futures[future]["progress_bar"].progress(
+                            min(state["current"] / state["total"], 1.0))
+                        futures[future]["status_text"].text(
+                            f"{state['current']}/{state['total']} fetched, {state['saved']} comments saved")
+
+                    for future in done:
+                        job = futures[future]
+                        try:
+                            saved = future.result()
+                            total_comments += saved
+                            job["progress_bar"].progress(1.0)
+                            failed = job["state"]["failed"]
+                            if failed:
+                                complete = False
+                                job["status_text"].text(
+                                    f"⚠️ Saved {saved} comments; fetching failed for {failed} {job['label']}")
+                            else:
+                                job["status_text"].text(
+                                    f"✅ Saved {saved} comments for {len(job['numbers'])} {job['label']}")
+                        except Exception as e:
+                            complete = False
+                            job["status_text"].text(f"❌ Error: {str(e)}")
+                            st.error(f"Error fetching {job['label']} comments: {e}")
 
-        pr_comments_map = {}
-        issue_comments_map = {}
+        if complete:
+            status.update(
+                label=f"✅ Fetched and saved {total_comments} comments", state="complete")
+        else:
+            status.update(
+                label=f"⚠️ Saved {total_comments} comments, some comments could not be fetched", state="error")
 
-        with ThreadPoolExecutor(max_workers=30) as executor:
-            futures = {}
-
-            if prs:
-                pr_numbers = [pr["pr_number"] for pr in prs]
-                with pr_container:
-                    st.write(
-                        f"📥 Fetching comments for {len(pr_numbers)} pull requests...")
-                    pr_status_text = st.empty()
-                    pr_status_text.text("⏳ Fetching in progress...")
-
-                future = executor.submit(
-                    github_client.get_all_pr_comments,
-                    owner, repo_name, pr_numbers, None
-                )
-                futures[future] = ("pr", len(pr_numbers), pr_status_text)
-
-            if issues:
-                issue_numbers = [issue["issue_number"] for issue in issues]
-                with issue_container:
-                    st.write(
-                        f"📥 Fetching comments for {len(issue_numbers)} issues...")
-                    issue_status_text = st.empty()
-                    issue_status_text.text("⏳ Fetching in progress...")
-
-                future = executor.submit(
-                    github_client.get_all_issue_comments,
-                    owner, repo_name, issue_numbers, None
-                )
-                futures[future] = ("issue", len(
-                    issue_numbers), issue_status_text)
-
-            for future in as_completed(futures):
-                data_type, count, status_text = futures[future]
-                try:
-                    result = future.result()
-                    if data_type == "pr":
-                        pr_comments_map = result
-                        status_text.text(
-                            f"✅ Fetched comments for {count} pull requests")
-                    elif data_type == "issue":
-                        issue_comments_map = result
-                        status_text.text(
-                            f"✅ Fetched comments for {count} issues")
-                except Exception as e:
-                    status_text.text(f"❌ Error: {str(e)}")
-                    st.error(f"Error fetching {data_type} comments: {e}")
-
-        if pr_comments_map:
-            st.write("💾 Saving PR comments to database...")
-            save_progress_bar = st.progress(0)
-            save_progress_text = st.empty()
-
-            processed = 0
-            total_prs = len(pr_comments_map)
-
-            for pr_number, comments in pr_comments_map.items():
-                processed += 1
-                save_progress_bar.progress(processed / total_prs)
-                save_progress_text.text(
-                    f"Saving PR #{pr_number} comments ({processed}/{total_prs})")
-
-                session = db_manager.get_session()
-                try:
-                    pr_rec = session.query(PullRequest).filter_by(
-                        repo_id=repo_record.id,
-                        pr_number=pr_number
-                    ).first()
-
-                    if not pr_rec:
-                        continue
-
-                    pr_id = pr_rec.id
-                    for comment in comments:
-                        contributor = db_manager.get_or_create_contributor({
-                            "username": comment["username"],
-                            "email": None,
-                            "avatar_url": None
-                        })
-
-                        db_manager.save_pr_comment({
-                            "pr_id": pr_id,
-                            "contributor_id": contributor.id,
-                            "comment_id": comment["comment_id"],
-                            "body": comment["body"],
-                            "created_at": comment["created_at"]
-                        })
-                        total_comments += 1
-                finally:
-                    session.close()
-
-            save_progress_bar.empty()
-            save_progress_text.empty()
-            st.write(
-                f"✅ Saved comments for {len(pr_comments_map)} pull requests")
-
-        if issue_comments_map:
-            st.write("💾 Saving issue comments to database...")
-            save_progress_bar = st.progress(0)
-            save_progress_text = st.empty()
-
-            processed = 0
-            total_issues = len(issue_comments_map)
-
-            for issue_number, comments in issue_comments_map.items():
-                processed += 1
-                save_progress_bar.progress(processed / total_issues)
-                save_progress_text.text(
-                    f"Saving Issue #{issue_number} comments ({processed}/{total_issues})")
-
-                session = db_manager.get_session()
-                try:
-                    issue_record = session.query(Issue).filter_by(
-                        repo_id=repo_record.id,
-                        issue_number=issue_number
-                    ).first()
-
-                    if issue_record:
-                        issue_id = issue_record.id
-                        for comment in comments:
-                            contributor = db_manager.get_or_create_contributor({
-                                "username": comment["username"],
-                                "email": None,
-                                "avatar_url": None
-                            })
-
-                            db_manager.save_issue_comment({
-                                "issue_id": issue_id,
-                                "contributor_id": contributor.id,
-                                "comment_id": comment["comment_id"],
-                                "body": comment["body"],
-                                "created_at": comment["created_at"]
-                            })
-                            total_comments += 1
-                finally:
-                    session.close()
-
-            save_progress_bar.empty()
-            save_progress_text.empty()
-            st.write(f"✅ Saved comments for {len(issue_comments_map)} issues")
-
-        status.update(
-            label=f"✅ Fetched and saved {total_comments} comments", state="complete")
-
-    return total_comments
-
-
-def _analyze_repository_content(db_manager: DatabaseManager, repo_record, repo_url: str, openai_key: str):
+    return total_comments, complete
+
+
+def _analyze_repository_content(db_manager: DatabaseManager, repo_record, repo_url: str, llm_client: OpenAIClient):
     """Analyze repository content and code quality."""
     with st.status("📁 Analyzing repository content and code quality...", expanded=True) as status:
-        llm_client = OpenAIClient(openai_key)
         repo_analyzer = RepositoryAnalyzer(llm_client)
 
+        # Nothing to redo if HEAD hasn't moved since the stored analysis
+        head_sha = repo_analyzer.get_head_sha(repo_url)
+        stored = db_manager.get_code_quality_metrics(repo_record.id)
+        if (head_sha and stored and stored.get("commit_sha") == head_sha
+                and stored.get("analyzer_version") == ANALYZER_VERSION
+                and db_manager.get_repository_content(repo_record.id)):
+            st.write(
+                f"✅ No changes since the last analysis (commit `{head_sha[:7]}`), reusing stored results")
+            status.update(label=f"✅ Repository analysis complete",
+                          state="complete")
+            return
+
         def progress_callback(message):
             st.write(f"⏳ {message}")
 
         analysis_results = repo_analyzer.analyze_repository(
-            repo_url, progress_callback=progress_callback)
+            repo_url, progress_callback=progress_callback, head_sha=head_sha)
 
         if "error" not in analysis_results:
             db_manager.save_repository_content({
@@ -409,12 +447,21 @@ def _analyze_repository_content(db_manager: DatabaseManager, repo_record, repo_u
             status.update(label="⚠️ Repository analysis failed", state="error")
 
 
-def analyze_repository(repo_url: str, github_token: str, openai_key: str):
-    """Analyze a GitHub repository and store results."""
+def analyze_repository(repo_url: str, github_token: str, openai_key: str, full_refetch: bool = False):
+    """Analyze a GitHub repository and store results.
+
+    Args:
+        repo_url: GitHub repository URL
+        github_token: GitHub API token
+        openai_key: OpenAI API key
+        full_refetch: Fetch everything again instead of only changes since the last analysis
+    """
     try:
-        github_client = GitHubClient(github_token)
-        db_manager = DatabaseManager()
-        llm_client = OpenAIClient(openai_key)
+        github_client = get_github_client(github_token)
+        db_manager = get_db_manager()
+        llm_client = get_llm_client(openai_key)
+
+        started_at = datetime.utcnow()
 
         with st.status("🔍 Fetching repository information...", expanded=True) as status:
             repo_info = github_client.get_repository(repo_url)
@@ -425,19 +472,35 @@ def analyze_repository(repo_url: str, github_token: str, openai_key: str):
             st.write(
                 f"### Repository: [{repo_info['name']}]({repo_info['url']})")
 
-        commits, prs, issues = _fetch_repository_data(
-            github_client, owner, repo_name)
+        # Re-analyses only fetch PRs and issues changed since the last run; saves upsert into the stored rows
+        since = None
+        if repo_record.last_analyzed and not full_refetch:
+            since = repo_record.last_analyzed.replace(tzinfo=timezone.utc)
+            st.info(
+                f"🔄 Fetching changes since the last analysis ({repo_record.last_analyzed.strftime('%Y-%m-%d %H:%M')} UTC)")
+
+        known_shas = None if full_refetch else db_manager.get_commit_shas(repo_record.id)
+
+        commits, prs, issues, fetch_complete = _fetch_repository_data(
+            github_client, owner, repo_name, since, known_shas)
 
         _analyze_data(db_manager, repo_record,
                       commits, prs, issues, llm_client)
 
-        _fetch_and_save_comments(
+        _, comments_complete = _fetch_and_save_comments(
             db_manager, github_client, repo_record, owner, repo_name, prs, issues)
 
         _analyze_repository_content(
-            db_manager, repo_record, repo_url, openai_key)
+            db_manager, repo_record, repo_url, llm_client)
 
-        db_manager.update_repository_last_analyzed(repo_record.repo_id)
+        # Only move the incremental cutoff forward when nothing was lost, otherwise
+        # the next run would skip whatever failed to fetch this time
+        if fetch_complete and comments_complete:
+            db_manager.update_repository_last_analyzed(
+                repo_record.repo_id, started_at)
+        else:
+            st.warning(
+                "⚠️ Some data could not be fetched. The next analysis will fetch it again.")
 
         st.markdown("---")
         st.success(
@@ -451,3 +514,8 @@ def analyze_repository(repo_url: str, github_token: str, openai_key: str):
         print(e)
         st.error(f"❌ Error analyzing repository: {str(e)}")
         return None, None
+    finally:
+        # A partial or failed run leaves last_analyzed unchanged, so drop cached
+        # contributor frames explicitly rather than relying on that key to change
+        from ui.contributors import compute_contributor_frame
+        compute_contributor_frame.clear()
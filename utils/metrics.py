@@ -1,5 +1,6 @@
 """Shared metric calculation utilities."""
 
+import hashlib
 import re
 from typing import List, Dict, Any
 
@@ -45,6 +46,55 @@ def check_pr_links_issue(pr_body: str, pr_title: str) -> bool:
     return False
 
 
+def heuristic_description_score(title: str, body: str) -> float:
+    """Estimate PR description quality (0-10) without an LLM.
+
+    Used as a fallback when the LLM is unavailable. Rewards length, structure
+    (headings, bullet lists, checklists), linked issues and testing notes.
+    """
+    if not body or not body.strip():
+        return 2.0 if title and len(title.split()) >= 4 else 1.0
+
+    score = 2.0
+    score += min(3.0, len(body.split()) / 50)
+
+    if re.search(r"^\s*#{1,6}\s+\S", body, re.MULTILINE):
+        score += 1.0
+    if re.search(r"^\s*[-*+]\s+\S", body, re.MULTILINE):
+        score += 1.0
+    if re.search(r"^\s*[-*]\s+\[[ xX]\]", body, re.MULTILINE):
+        score += 1.0
+    if check_pr_links_issue(body, title):
+        score += 1.0
+    if re.search(r"\b(test|tests|tested|testing)\b", body, re.IGNORECASE):
+        score += 1.0
+
+    return round(min(score, 10.0), 1)
+
+
+def description_cache_key(kind: str, model: str, title: str, body: str) -> str:
+    """Build the LLM cache key for a PR or issue description.
+
+    Texts are lowercased and whitespace is collapsed first, so trivially
+    different descriptions share a key.
+
+    Args:
+        kind: "pr" or "issue", so the two prompts never share cached verdicts
+        model: LLM model the verdict comes from
+        title: Description title
+        body: Description body
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    def normalize(text: str) -> str:
+        return " ".join((text or "").lower().split())
+
+    return hashlib.sha256("\0".join([
+        kind, model, normalize(title), normalize(body)
+    ]).encode()).hexdigest()
+
+
 def calculate_avg_comment_length(comments: List[str]) -> float:
     """Calculate average length of comments."""
     if not comments:
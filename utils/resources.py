@@ -0,0 +1,24 @@
+"""Shared resources cached across Streamlit reruns and sessions."""
+
+import streamlit as st
+from database import DatabaseManager
+from github_client import GitHubClient
+from llm import OpenAIClient
+
+
+@st.cache_resource
+def get_db_manager() -> DatabaseManager:
+    """Get the process-wide DatabaseManager and its connection pool."""
+    return DatabaseManager()
+
+
+@st.cache_resource
+def get_github_client(token: str) -> GitHubClient:
+    """Get the shared GitHubClient for a token, validating the token only once."""
+    return GitHubClient(token)
+
+
+@st.cache_resource
+def get_llm_client(api_key: str) -> OpenAIClient:
+    """Get the shared OpenAIClient for an API key."""
+    return OpenAIClient(api_key)